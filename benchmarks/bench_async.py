@@ -0,0 +1,74 @@
+"""
+Measure how long a bulk CREATE statement stalls the event loop when parsed
+with CypherParser.parse() directly and with AsyncCypherParser on a thread
+or process executor.
+
+A ticker task sleeps 1 ms at a time and records the longest gap between
+its wake-ups while the parses run.
+
+    python benchmarks/bench_async.py [--nodes 5000] [--parses 4]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from pcypher import CypherParser  # noqa: E402
+from pcypher.aio import AsyncCypherParser  # noqa: E402
+
+
+async def ticker(gaps):
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def measure(parse, query, parses):
+    gaps = []
+    task = asyncio.create_task(ticker(gaps))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(parse(query) for _ in range(parses)))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.01)  # Let the ticker record the last gap.
+    task.cancel()
+    return elapsed, max(gaps)
+
+
+async def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--nodes", type=int, default=5000, help="Nodes per CREATE")
+    args.add_argument("--parses", type=int, default=4, help="Concurrent parses")
+    args = args.parse_args()
+
+    query = "CREATE " + ", ".join(
+        f"(n{i}:Person {{name: 'p{i}', age: {i}}})" for i in range(args.nodes)
+    )
+    print(f"query of {len(query) // 1024} KB, {args.parses} parses")
+
+    parser = CypherParser(optimize=True)
+
+    async def blocking(data):
+        return parser.parse(data)
+
+    cases = [("blocking", blocking)]
+    for kind in ("thread", "process"):
+        cases.append((kind, AsyncCypherParser(executor=kind).parse))
+    for name, parse in cases:
+        await parse(query)  # Warm up the executor.
+        elapsed, stall = await measure(parse, query, args.parses)
+        print(f"{name:9} total {elapsed:7.2f} s  longest stall {stall * 1000:8.1f} ms")
+    for _, parse in cases[1:]:
+        parse.__self__.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
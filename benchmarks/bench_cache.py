@@ -0,0 +1,72 @@
+"""
+Compare parse throughput without a cache, with the exact-text LRU cache and
+with the literal-normalizing fingerprint cache.
+
+The workload replays the sample corpus with the NUMBER and STRING literals
+of every query randomized, the way log-replay traffic differs only in
+literal values.
+
+    python benchmarks/bench_cache.py [--queries 5000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+
+LITERAL = re.compile(r"'[^'\\\n]*'|\b\d+\b")
+
+
+def randomize(query, rng):
+    def repl(match):
+        if match.group().startswith("'"):
+            return f"'v{rng.randrange(1000)}'"
+        return str(rng.randrange(1, 1000))
+
+    return LITERAL.sub(repl, query)
+
+
+def run(parser, queries):
+    start = time.perf_counter()
+    for query in queries:
+        parser.parse(query)
+    return time.perf_counter() - start
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--queries", type=int, default=5000, help="Workload size")
+    args = args.parse_args()
+
+    rng = random.Random(0)
+    # Leave out variable length bounds such as [*1..2], which must stay
+    # ordered, and backtick identifiers, which may contain quotes.
+    shapes = [query for query in data_list if "*" not in query and "`" not in query]
+    queries = [randomize(rng.choice(shapes), rng) for _ in range(args.queries)]
+
+    cases = (
+        ("no cache", CypherParser(optimize=True)),
+        ("exact", CypherParser(optimize=True, cache_size=10000)),
+        (
+            "fingerprint",
+            CypherParser(optimize=True, cache_size=10000, fingerprint=True),
+        ),
+    )
+    for name, parser in cases:
+        elapsed = run(parser, queries)
+        info = parser.cache_info()
+        ratio = "" if info is None else f"  hit ratio {info.hits / len(queries):.1%}"
+        print(f"{name:12} {len(queries) / elapsed:10.0f} queries/s{ratio}")
+
+
+if __name__ == "__main__":
+    main()
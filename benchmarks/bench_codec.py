@@ -0,0 +1,74 @@
+"""
+Compare pcypher.codec with pickle, JSON and str() for parse results of the
+sample corpus and of a bulk CREATE statement: encoded size, dump time and
+load time.  Every encoding is checked to round-trip first (JSON turns
+tuples into lists, so it is compared after the same conversion).
+
+    python benchmarks/bench_codec.py [--rounds 200]
+"""
+
+import argparse
+import ast
+import json
+import os
+import pickle
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher import codec  # noqa: E402
+
+FORMATS = {
+    "codec": (codec.dumps, codec.loads),
+    "pickle": (lambda r: pickle.dumps(r, pickle.HIGHEST_PROTOCOL), pickle.loads),
+    "json": (lambda r: json.dumps(r).encode(), json.loads),
+    "str": (lambda r: str(r).encode(), lambda b: ast.literal_eval(b.decode())),
+}
+
+
+def timed(func, items, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / rounds
+
+
+def report(title, results, rounds):
+    print(title)
+    for name, (dump, load) in FORMATS.items():
+        encoded = [dump(result) for result in results]
+        expected = json.loads(json.dumps(results)) if name == "json" else results
+        if [load(data) for data in encoded] != expected:
+            raise SystemExit(f"{name} does not round-trip")
+        size = sum(len(data) for data in encoded)
+        dump_time = timed(dump, results, rounds)
+        load_time = timed(load, encoded, rounds)
+        print(
+            f"  {name:7} {size:9d} bytes  dump {dump_time * 1000:8.2f} ms"
+            f"  load {load_time * 1000:8.2f} ms"
+        )
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=200, help="Repetitions")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    corpus = [parser.parse(query) for query in data_list]
+    report(f"sample corpus ({len(corpus)} results)", corpus, args.rounds)
+
+    bulk = "CREATE " + ", ".join(
+        f"(n{i}:Person {{name: 'p{i}', age: {i}, score: {i}.5}})" for i in range(2000)
+    )
+    report("bulk CREATE of 2000 nodes", [parser.parse(bulk)], args.rounds // 10 or 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare cold `pcypher` CLI runs with requests to a `pcypher serve` daemon.
+
+Three ways to parse one query of the sample corpus at a time:
+
+  cold      a fresh `pcypher QUERY` process per query
+  connect   a fresh `pcypher --connect PATH QUERY` process per query
+  client    daemon.Client round-trips over one open connection
+
+    python benchmarks/bench_daemon.py [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher.daemon import Client  # noqa: E402
+
+CLI = [sys.executable, "-m", "pcypher.main"]
+ENV = dict(os.environ, PYTHONPATH=SRC)
+
+
+def per_query(times):
+    return f"median {statistics.median(times) * 1000:8.2f} ms/query"
+
+
+def run_cli(extra, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        subprocess.run(CLI + extra + [query], env=ENV, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def wait_for(path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise SystemExit(f"daemon did not create {path}")
+        time.sleep(0.05)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=20, help="Queries per mode")
+    args = args.parse_args()
+
+    queries = [data_list[i % len(data_list)] for i in range(args.runs)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pcypher.sock")
+        daemon = subprocess.Popen(CLI + ["serve", "--socket", path], env=ENV)
+        try:
+            wait_for(path)
+            print(f"cold     {per_query(run_cli([], queries))}")
+            print(f"connect  {per_query(run_cli(['--connect', path], queries))}")
+            times = []
+            with Client(path) as client:
+                for query in queries * 10:
+                    start = time.perf_counter()
+                    client.parse(query)
+                    times.append(time.perf_counter() - start)
+            print(f"client   {per_query(times)}")
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cost and effect of pcypher.fold on the sample corpus and on a query made of
+N constant subexpressions.
+
+Reports the nodes folding eliminates and its time next to the parse itself,
+so the overhead of CypherParser(fold_constants=True) can be read off.
+
+    python benchmarks/bench_fold.py [--size 2000] [--rounds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.fold import fold  # noqa: E402
+
+
+def timed(func, queries, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--size", type=int, default=2000, help="Subexpressions")
+    args.add_argument("--rounds", type=int, default=5, help="Repetitions")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True, on_error="collect")
+    n = args.size
+    cases = {
+        "corpus": list(data_list),
+        "constant": [
+            "RETURN " + ", ".join(f"{i} * 2 + sqrt({i}) > -(-{i})" for i in range(n))
+        ],
+    }
+    for case, queries in cases.items():
+        results = [parser.parse(query) for query in queries]
+        results = [r for r in results if r is not None and not isinstance(r, Exception)]
+        eliminated = sum(fold(result)[1] for result in results)
+        parse = timed(parser.parse, queries, args.rounds)
+        folding = timed(fold, results, args.rounds)
+        print(
+            f"{case}: {eliminated} nodes eliminated, parse {parse * 1e3:.1f} ms, "
+            f"fold {folding * 1e3:.1f} ms (+{folding / parse:.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
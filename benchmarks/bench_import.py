@@ -0,0 +1,85 @@
+"""
+Measure import cost of pcypher with ``python -X importtime``.
+
+Each statement runs in a fresh interpreter; the report shows the median
+cumulative import time of the modules it loads from the package, and
+whether PLY got imported.  The last line times building a parser and the
+first parse, which is where PLY and the grammar tables are loaded.
+
+    python benchmarks/bench_import.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+STATEMENTS = [
+    "import pcypher",
+    "from pcypher import CypherSyntaxError",
+    "from pcypher import RESERVED",
+    "from pcypher import CypherParser",
+]
+
+FIRST_PARSE = """
+import time
+start = time.perf_counter()
+from pcypher import get_parser
+get_parser().parse("RETURN 1")
+print(time.perf_counter() - start)
+"""
+
+
+def importtime(statement):
+    """Return (microseconds importing pcypher modules, whether ply was loaded)."""
+    code = f"import sys; sys.path.insert(0, {SRC!r}); {statement}"
+    run = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    ply = False
+    for line in run.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip().startswith("ply"):
+            ply = True
+        # Entries are indented by nesting depth below the leading space;
+        # only top-level ones are summed, as they include their imports.
+        if name[1:2] != " " and cumulative.strip().isdigit():
+            if name.strip().split(".")[0] in ("pcypher", "ply"):
+                total += int(cumulative)
+    return total, ply
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=5, help="Interpreters per statement")
+    args = args.parse_args()
+
+    # Compile the package first so no run pays for writing bytecode.
+    subprocess.run([sys.executable, "-m", "compileall", "-q", SRC], check=True)
+    for statement in STATEMENTS:
+        samples = [importtime(statement) for _ in range(args.runs)]
+        micros = statistics.median(sample[0] for sample in samples)
+        ply = "loads ply" if samples[0][1] else "no ply"
+        print(f"{statement:40} {micros / 1000:7.2f} ms  {ply}")
+    code = f"import sys; sys.path.insert(0, {SRC!r})\n{FIRST_PARSE}"
+    samples = []
+    for _ in range(args.runs):
+        run = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        samples.append(float(run.stdout))
+    median = statistics.median(samples)
+    print(f"{'import + get_parser() + first parse':40} {median * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Keystroke latency of CypherParser.reparse() against a full parse.
+
+Builds a query of about --size characters from MATCH/WITH clauses and
+types --keys characters one at a time at a few places: into a string
+literal and a number in the middle of the query, and at its end, where
+some keystrokes leave the query invalid.  Every keystroke is parsed both
+incrementally and from scratch, and the results are compared.
+
+    python benchmarks/bench_incremental.py [--size 10000] [--keys 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from pcypher import CypherParser  # noqa: E402
+
+
+def query(size):
+    parts = []
+    i = 0
+    while sum(map(len, parts)) < size:
+        parts.append(
+            f"MATCH (a{i}:Person {{name: 'n{i}'}})-[:KNOWS]->(b{i}) "
+            f"WHERE a{i}.age > {i} WITH a{i}, b{i} "
+        )
+        i += 1
+    parts.append("RETURN a0")
+    return "".join(parts)
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--size", type=int, default=10000, help="Query length")
+    args.add_argument("--keys", type=int, default=50, help="Keystrokes per place")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    text = query(args.size)
+    middle = text.index("'", len(text) // 2) + 1
+    places = {
+        "string": (middle, "abcdefghij"),
+        "number": (text.index("> ", len(text) // 3) + 2, "1234567890"),
+        # Half of these keystrokes leave the query invalid, e.g. "RETURN a0 +".
+        "end": (len(text), " + 12345"),
+    }
+    print(f"query of {len(text)} characters")
+    for name, (offset, keys) in places.items():
+        state = parser.parse_incremental(text)
+        incremental = []
+        full = []
+        for k in range(args.keys):
+            key = keys[k % len(keys)]
+            start = time.perf_counter()
+            state = parser.reparse(state, offset + k, 0, key)
+            incremental.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            result, errors = parser.parse_with_errors(state.text)
+            full.append(time.perf_counter() - start)
+            if result != state.result or len(errors) != len(state.errors):
+                raise SystemExit(f"results differ after typing at {name}")
+        print(
+            f"  {name:7} reparse median {statistics.median(incremental) * 1e3:7.3f} ms"
+            f" p95 {percentile(incremental, 0.95) * 1e3:7.3f} ms |"
+            f" full parse median {statistics.median(full) * 1e3:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory held by parse results of a large generated CREATE corpus, plain and
+hash-consed by pcypher.intern.
+
+  plain     CypherParser() results
+  intern    CypherParser(intern=True): subtrees shared within each query
+  shared    one Interner for the whole corpus: shared across queries too,
+            with the Interner's table counted
+
+Each query creates N people and links them in a ring, so every node
+reference repeats; retained memory is measured with tracemalloc.
+
+    python benchmarks/bench_intern.py [--queries 100] [--size 100]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from pcypher import CypherParser  # noqa: E402
+from pcypher.intern import Interner  # noqa: E402
+
+
+def corpus(queries, size):
+    for q in range(queries):
+        people = ", ".join(
+            f"(p{i}:Person {{name: 'P{i}', team: 'T{i % 7}', q: {q}}})" for i in range(size)
+        )
+        ring = ", ".join(
+            f"(p{i})-[:KNOWS {{since: 2020}}]->(p{(i + 1) % size})" for i in range(size)
+        )
+        yield f"CREATE {people}, {ring}"
+
+
+def retained(build, queries):
+    """Return (bytes held by build()'s results, seconds it takes)."""
+    start = time.perf_counter()
+    build(queries)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    results = build(queries)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return held, elapsed
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--queries", type=int, default=100, help="CREATE queries")
+    args.add_argument("--size", type=int, default=100, help="People per query")
+    args = args.parse_args()
+
+    queries = list(corpus(args.queries, args.size))
+    plain = CypherParser(optimize=True)
+    interning = CypherParser(optimize=True, intern=True)
+
+    def shared(queries):
+        interner = Interner()
+        return [interner.intern(plain.parse(query)) for query in queries], interner
+
+    modes = {
+        "plain": lambda queries: [plain.parse(query) for query in queries],
+        "intern": lambda queries: [interning.parse(query) for query in queries],
+        "shared": shared,
+    }
+    chars = sum(map(len, queries))
+    print(f"{len(queries)} queries, {chars} characters")
+    baseline = None
+    for name, build in modes.items():
+        held, elapsed = retained(build, queries)
+        baseline = baseline or held
+        print(
+            f"  {name:8} {held / 2**20:8.1f} MiB ({held / baseline:4.0%})"
+            f" {elapsed:7.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
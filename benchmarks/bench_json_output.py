@@ -0,0 +1,78 @@
+"""
+Compare the CLI output formats from the consumer's side: reading the repr
+lines back with ast.literal_eval() against reading NDJSON lines with
+json.loads(), plus the cost of writing NDJSON with
+pcypher.jsonstream.write_json(), with the json module's streaming
+iterencode() and with json.dumps(), which builds each string in one piece.
+
+    python benchmarks/bench_json_output.py [--rounds 50]
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.jsonstream import write_json  # noqa: E402
+
+
+def timed(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=50, help="Repetitions")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    results = [parser.parse(query) for query in data_list]
+    repr_lines = [str(result) for result in results]
+
+    def write_stream():
+        out = io.StringIO()
+        for result in results:
+            write_json(result, out)
+            out.write("\n")
+        return out.getvalue()
+
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def write_iterencode():
+        out = io.StringIO()
+        for result in results:
+            for chunk in encoder.iterencode(result):
+                out.write(chunk)
+            out.write("\n")
+        return out.getvalue()
+
+    def write_dumps():
+        return "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in results)
+
+    ndjson_lines = write_stream().splitlines()
+    assert ndjson_lines == write_dumps().splitlines()
+
+    print(f"{len(results)} results")
+    print(f"write ndjson, write_json()  {timed(write_stream, args.rounds):8.2f} ms")
+    print(f"write ndjson, iterencode()  {timed(write_iterencode, args.rounds):8.2f} ms")
+    print(f"write ndjson, json.dumps()  {timed(write_dumps, args.rounds):8.2f} ms")
+    read_repr = timed(lambda: [ast.literal_eval(s) for s in repr_lines], args.rounds)
+    read_json = timed(lambda: [json.loads(s) for s in ndjson_lines], args.rounds)
+    print(f"read repr, literal_eval()   {read_repr:8.2f} ms")
+    print(f"read ndjson, json.loads()   {read_json:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare the PLY lexer built from CypherLexer with pcypher.fastlex.FastLexer:
+tokens per second, CypherLexer.tokenize() throughput and end-to-end parse
+throughput with each backend.  tests/test_lexer.py checks that both
+produce the same tokens.
+
+    python benchmarks/bench_lexer.py [--rounds 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+
+
+def lex_rate(parser, queries, rounds):
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            count += len(parser._tokenize(query)[0])
+    return count / (time.perf_counter() - start)
+
+
+def tokenize_rate(parser, queries, rounds):
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            count += len(parser.lexer.tokenize(query))
+    return count / (time.perf_counter() - start)
+
+
+def parse_rate(parser, queries, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            parser.parse(query)
+    return rounds * len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=200, help="Passes over corpus")
+    args = args.parse_args()
+
+    ply = CypherParser(optimize=True, on_error="collect")
+    fast = CypherParser(optimize=True, on_error="collect", lexer="fast")
+    for name, parser in (("ply", ply), ("fast", fast)):
+        tps = lex_rate(parser, data_list, args.rounds)
+        arrays = tokenize_rate(parser, data_list, args.rounds)
+        qps = parse_rate(parser, data_list, args.rounds // 10 or 1)
+        print(
+            f"{name:5} {tps:10.0f} tokens/s {arrays:10.0f} tokenize() tokens/s"
+            f" {qps:8.0f} queries/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
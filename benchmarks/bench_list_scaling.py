@@ -0,0 +1,52 @@
+"""
+Show how parse time grows with the length of a list in one query.
+
+Parses ``UNWIND [...] AS row RETURN row`` list literals and
+``CREATE (n0), (n1), ...`` pattern lists of increasing size.  Time per
+element should stay flat as the lists grow.
+
+    python benchmarks/bench_list_scaling.py [--max 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from pcypher import CypherParser  # noqa: E402
+
+
+def unwind_query(n):
+    items = ", ".join(f"{{id: {i}}}" for i in range(n))
+    return f"UNWIND [{items}] AS row RETURN row"
+
+
+def create_query(n):
+    return "CREATE " + ", ".join(f"(n{i})" for i in range(n))
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--min", type=int, default=1000, help="Smallest list")
+    args.add_argument("--max", type=int, default=1000000, help="Largest list")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    print(f"{'query':8} {'elements':>9} {'seconds':>9} {'us/element':>11}")
+    for name, build in (("UNWIND", unwind_query), ("CREATE", create_query)):
+        n = args.min
+        while n <= args.max:
+            query = build(n)
+            start = time.perf_counter()
+            result = parser.parse(query)
+            elapsed = time.perf_counter() - start
+            assert result is not None
+            print(f"{name:8} {n:9} {elapsed:9.3f} {elapsed / n * 1e6:11.2f}")
+            n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare the tuple AST with the typed_ast Node classes: memory per node and
+the time to walk every tree of the sample corpus.
+
+Each walk counts binary operations and property lookups, the kind of
+question a linter or rewriter asks, once by comparing tuple tags and once
+by checking node classes.
+
+    python benchmarks/bench_nodes.py [--rounds 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.nodes import BinOp, Node, Property, to_nodes, to_tuples  # noqa: E402
+
+
+def walk_tuples(tree, counts):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, tuple):
+            if node and isinstance(node[0], str):
+                if node[0] == "binop":
+                    counts[0] += 1
+                elif node[0] == "property":
+                    counts[1] += 1
+            stack.extend(node)
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+
+
+def walk_nodes(tree, counts):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Node):
+            if type(node) is BinOp:
+                counts[0] += 1
+            elif type(node) is Property:
+                counts[1] += 1
+            stack.extend(node.children())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+
+
+def count_nodes(tree):
+    stack = [tree]
+    total = 0
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Node):
+            total += 1
+            stack.extend(node.children())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return total
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def timed(walk, trees, rounds):
+    counts = [0, 0]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for tree in trees:
+            walk(tree, counts)
+    return time.perf_counter() - start, counts
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=200, help="Walks per tree")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    results = [parser.parse(query) for query in data_list]
+    # Both forms are rebuilt from the parsed trees, so they share the same
+    # strings and numbers and only their containers are measured.
+    tuples, tuple_bytes = allocated(lambda: [to_tuples(tree) for tree in results])
+    nodes, node_bytes = allocated(lambda: [to_nodes(tree) for tree in results])
+    total = sum(count_nodes(tree) for tree in nodes)
+
+    print(f"{len(data_list)} queries, {total} tagged nodes")
+    print(f"{'form':8} {'bytes/node':>10} {'walk ms':>9}")
+    for name, trees, size, walk in (
+        ("tuple", tuples, tuple_bytes, walk_tuples),
+        ("node", nodes, node_bytes, walk_nodes),
+    ):
+        elapsed, counts = timed(walk, trees, args.rounds)
+        print(
+            f"{name:8} {size / total:10.1f} {elapsed * 1000 / args.rounds:9.2f}"
+            f"   binop={counts[0] // args.rounds} property={counts[1] // args.rounds}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure CypherParser.parse_many() throughput for growing worker counts.
+
+    python benchmarks/bench_parse_many.py [--copies 40] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+
+
+def main():
+    default_workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    args = argparse.ArgumentParser()
+    args.add_argument("--copies", type=int, default=40, help="Corpus repetitions")
+    args.add_argument("--chunksize", type=int, default=64, help="Queries per task")
+    args.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    queries = data_list * args.copies
+    expected = None
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = parser.parse_many(queries, workers=workers, chunksize=args.chunksize)
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = results
+        elif results != expected:
+            sys.exit(f"results with {workers} workers differ from the first run")
+        baseline = baseline or elapsed
+        print(
+            f"{workers:3} workers {len(queries) / elapsed:10.0f} queries/s"
+            f"  speedup {baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-phase profile of parsing the sample corpus, and what profiling costs.
+
+Parses data_list with CypherParser(profile=Profiler()), prints the report,
+and compares throughput with an uninstrumented parser, which runs the
+plain code paths.
+
+    python benchmarks/bench_profile.py [--rounds 20] [--limit 15]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.profile import Profiler  # noqa: E402
+
+
+def rate(parser, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in data_list:
+            parser.parse(query)
+    return rounds * len(data_list) / (time.perf_counter() - start)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=20, help="Passes over corpus")
+    args.add_argument("--limit", type=int, default=15, help="Actions to list")
+    args = args.parse_args()
+
+    profiler = Profiler()
+    plain = CypherParser(optimize=True, on_error="collect")
+    profiled = CypherParser(optimize=True, on_error="collect", profile=profiler)
+    plain_rate = rate(plain, args.rounds)
+    profiled_rate = rate(profiled, args.rounds)
+    print(profiler.report(args.limit))
+    print(
+        f"\nplain {plain_rate:8.0f} queries/s, profiled {profiled_rate:8.0f}"
+        f" queries/s ({profiled_rate / plain_rate - 1:+.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cost of source span tracking, with it off and on.
+
+Parses data_list three ways: on a plain parser, on a CypherParser(spans=True)
+through parse_with_errors(), which records nothing, and through
+parse_with_spans().  Also reports the memory held by the results and by
+their span tables.
+
+    python benchmarks/bench_spans.py [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+
+
+def rate(parse, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in data_list:
+            parse(query)
+    return rounds * len(data_list) / (time.perf_counter() - start)
+
+
+def retained(parse):
+    """Return the bytes held by the return values of parse over data_list."""
+    tracemalloc.start()
+    kept = [parse(query) for query in data_list]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=20, help="Passes over corpus")
+    args = args.parse_args()
+
+    plain = CypherParser(optimize=True)
+    spanned = CypherParser(optimize=True, spans=True)
+    modes = {
+        "plain parse_with_errors": plain.parse_with_errors,
+        "spans=True parse_with_errors": spanned.parse_with_errors,
+        "spans=True parse_with_spans": spanned.parse_with_spans,
+    }
+    for parse in modes.values():
+        rate(parse, 1)  # Warm up.
+    base = None
+    for name, parse in modes.items():
+        queries = rate(parse, args.rounds)
+        base = base or queries
+        print(f"{name:30} {queries:8.0f} queries/s ({queries / base - 1:+.0%})")
+
+    results = retained(lambda query: plain.parse_with_errors(query)[0])
+    tables = retained(lambda query: spanned.parse_with_spans(query)[:2])
+    print(
+        f"\nretained: results {results / 2**10:.0f} KiB,"
+        f" results and span tables {tables / 2**10:.0f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
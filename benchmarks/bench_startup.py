@@ -0,0 +1,69 @@
+"""
+Measure CypherParser() construction time, default vs. optimized mode.
+
+Cold numbers come from a fresh interpreter per sample, so they include
+importing the table modules; warm numbers rebuild the parser in-process.
+
+    python benchmarks/bench_startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+from pcypher import CypherParser  # noqa: E402
+
+COLD = """
+import sys, time
+sys.path.insert(0, {src!r})
+from pcypher import CypherParser
+start = time.perf_counter()
+CypherParser(optimize={optimize})
+print(time.perf_counter() - start)
+"""
+
+
+def cold(optimize, runs):
+    code = COLD.format(src=SRC, optimize=optimize)
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        samples.append(float(out.stdout.strip()))
+    return samples
+
+
+def warm(optimize, runs):
+    CypherParser(optimize=optimize)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        CypherParser(optimize=optimize)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--runs", type=int, default=10, help="Samples per case")
+    args = args.parse_args()
+
+    for name, func in (("cold", cold), ("warm", warm)):
+        for optimize in (False, True):
+            samples = func(optimize, args.runs)
+            mode = "optimize" if optimize else "default"
+            print(
+                f"{name:4} {mode:8} median {statistics.median(samples) * 1000:8.2f} ms"
+                f"  min {min(samples) * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
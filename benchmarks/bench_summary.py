@@ -0,0 +1,61 @@
+"""
+Query summaries from the grammar actions against a walk over the result.
+
+Times, over data_list: a plain parse_with_errors(); the same followed by
+pcypher.summary.summarize(), the second traversal parse_with_summary()
+replaces; and parse_with_summary().  tests/test_summary.py checks that the
+two agree.
+
+    python benchmarks/bench_summary.py [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.summary import summarize  # noqa: E402
+
+
+def walked(parser, query):
+    result, errors = parser.parse_with_errors(query)
+    summary = summarize(result) if result is not None else None
+    return result, summary, errors
+
+
+def rate(parse, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in data_list:
+            parse(query)
+    return rounds * len(data_list) / (time.perf_counter() - start)
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--rounds", type=int, default=20, help="Passes over corpus")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    modes = {
+        "parse_with_errors": parser.parse_with_errors,
+        "parse_with_errors + walk": lambda query: walked(parser, query),
+        "parse_with_summary": parser.parse_with_summary,
+    }
+    for parse in modes.values():
+        rate(parse, 1)  # Warm up.
+    base = None
+    for name, parse in modes.items():
+        queries = rate(parse, args.rounds)
+        base = base or queries
+        print(f"{name:26} {queries:8.0f} queries/s ({queries / base - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
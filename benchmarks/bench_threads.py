@@ -0,0 +1,56 @@
+"""
+Parse the sample corpus from many threads sharing one CypherParser.
+
+tests/test_threads.py checks that the results are those of a
+single-threaded parse.
+
+    python benchmarks/bench_threads.py [--threads 32] [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import get_parser  # noqa: E402
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--threads", type=int, default=32, help="Worker threads")
+    args.add_argument("--rounds", type=int, default=20, help="Corpus passes per thread")
+    args = args.parse_args()
+
+    parser = get_parser()
+    barrier = threading.Barrier(args.threads)
+
+    def work(offset):
+        barrier.wait()
+        for _ in range(args.rounds):
+            # Start each thread at a different query so parses overlap.
+            for i in range(len(data_list)):
+                parser.parse(data_list[(i + offset) % len(data_list)])
+
+    threads = [
+        threading.Thread(target=work, args=(n,)) for n in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = args.threads * args.rounds * len(data_list)
+    print(f"{total} parses on {args.threads} threads in {elapsed:.2f} s")
+    print(f"{total / elapsed:.0f} queries/s, {len(parser._pool)} pooled states")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Walk throughput of pcypher.visitor on deep and wide trees, next to the
+plain recursive walker consumers used to write.
+
+  deep   RETURN with a chain of N ANDed comparisons (a tree N levels deep)
+  wide   UNWIND of an N-element list literal
+  corpus every query of the sample corpus
+
+Each walk counts property lookups; the transformer upper-cases their keys.
+
+    python benchmarks/bench_visitor.py [--size 20000] [--rounds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+from pcypher.visitor import Transformer, Visitor  # noqa: E402
+
+
+def recursive(node, counts):
+    if isinstance(node, tuple):
+        if node and node[0] == "property":
+            counts[0] += 1
+        for item in node:
+            recursive(item, counts)
+    elif isinstance(node, list):
+        for item in node:
+            recursive(item, counts)
+
+
+class CountProperties(Visitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_property(self, node):
+        self.count += 1
+
+
+class UpperKeys(Transformer):
+    def transform_property(self, node):
+        return ("property", node[1], node[2].upper())
+
+
+def size(tree):
+    counts = [0]
+
+    class Count(Visitor):
+        def generic_visit(self, node):
+            counts[0] += 1
+
+    Count().walk(tree)
+    return counts[0]
+
+
+def timed(func, trees, rounds):
+    start = time.perf_counter()
+    try:
+        for _ in range(rounds):
+            for tree in trees:
+                func(tree)
+    except RecursionError:
+        return None
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--size", type=int, default=20000, help="Depth and width")
+    args.add_argument("--rounds", type=int, default=5, help="Repetitions")
+    args = args.parse_args()
+
+    parser = CypherParser(optimize=True)
+    n = args.size
+    cases = {
+        "deep": [parser.parse("RETURN " + " AND ".join(f"n.p{i} = {i}" for i in range(n)))],
+        "wide": [parser.parse(f"UNWIND [{', '.join(f'n.p{i}' for i in range(n))}] AS x")],
+        "corpus": [parser.parse(query) for query in data_list],
+    }
+    walkers = {
+        "recursive": lambda tree: recursive(tree, [0]),
+        "Visitor": lambda tree: CountProperties().walk(tree),
+        "Transformer": lambda tree: UpperKeys().transform(tree),
+    }
+    for case, trees in cases.items():
+        nodes = sum(size(tree) for tree in trees)
+        print(f"{case}: {nodes} tagged nodes")
+        for name, walk in walkers.items():
+            elapsed = timed(walk, trees, args.rounds)
+            if elapsed is None:
+                print(f"  {name:12} RecursionError")
+            else:
+                print(f"  {name:12} {nodes / elapsed:12.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
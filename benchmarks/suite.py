@@ -0,0 +1,211 @@
+"""
+Parse-time benchmark suite and regression gate.
+
+Cases:
+
+  construct/default     CypherParser(): build the LALR tables from the grammar
+  construct/optimized   CypherParser(optimize=True): load the packaged tables
+  lex/corpus            CypherLexer.tokenize() over every query of data_list
+  parse/corpus          parse() of every query of data_list
+  scale/long-list       UNWIND of a 10000-element list literal
+  scale/deep-nesting    RETURN of an expression nested 500 parentheses deep
+  scale/wide-create     CREATE of 2000 nodes with properties
+  threads/corpus        data_list split over 8 threads sharing one parser
+
+Each case is timed for --repeat samples of at least --min-time seconds; the
+fastest sample's seconds per operation is reported, as the least disturbed
+by other load on the machine.  Every query of data_list is also
+lexed and parsed on its own, and those timings are listed in the JSON.
+
+--json FILE writes the results, and --baseline FILE compares them with a
+previous --json run: a case more than --threshold slower than in the
+baseline is a regression and makes the script exit with status 1.  Per-query
+timings are compared too but only reported, as they are too short to gate on.
+
+    python benchmarks/suite.py [--json results.json]
+    python benchmarks/suite.py --baseline results.json [--threshold 0.25]
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from cypher_sample import data_list  # noqa: E402
+from pcypher import CypherParser  # noqa: E402
+
+THREADS = 8
+
+
+def measure(func, min_time, repeat):
+    """Return the best seconds per call of func over repeat samples."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed * 4 >= min_time else 10
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return min(samples)
+
+
+def threaded(parser, queries):
+    """Return a function parsing queries split over THREADS threads."""
+    chunks = [queries[i::THREADS] for i in range(THREADS)]
+
+    def run():
+        threads = [
+            threading.Thread(target=lambda chunk=chunk: [parser.parse(q) for q in chunk])
+            for chunk in chunks
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return run
+
+
+def cases(parser):
+    """Return {name: function} for every benchmark case."""
+    lexer = parser.lexer
+    long_list = "UNWIND [" + ", ".join(str(i) for i in range(10000)) + "] AS x RETURN x"
+    deep = "RETURN " + "(" * 500 + "1" + " + 1)" * 500
+    wide = "CREATE " + ", ".join(
+        f"(n{i}:Node {{id: {i}, name: 'n{i}'}})" for i in range(2000)
+    )
+    return {
+        "construct/default": lambda: CypherParser(),
+        "construct/optimized": lambda: CypherParser(optimize=True),
+        "lex/corpus": lambda: [lexer.tokenize(query) for query in data_list],
+        "parse/corpus": lambda: [parser.parse(query) for query in data_list],
+        "scale/long-list": lambda: parser.parse(long_list),
+        "scale/deep-nesting": lambda: parser.parse(deep),
+        "scale/wide-create": lambda: parser.parse(wide),
+        "threads/corpus": threaded(parser, data_list),
+    }
+
+
+def run(args):
+    parser = CypherParser(optimize=True, on_error="collect")
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "cases": {},
+        "queries": [],
+    }
+    for name, func in cases(parser).items():
+        if not any(fnmatch.fnmatch(name, pattern) for pattern in args.cases):
+            continue
+        seconds = measure(func, args.min_time, args.repeat)
+        results["cases"][name] = seconds
+        print(f"{name:22} {seconds * 1e3:10.3f} ms")
+    if args.queries:
+        lexer = parser.lexer
+        for query in data_list:
+            results["queries"].append(
+                {
+                    "query": query,
+                    "lex": measure(lambda: lexer.tokenize(query), args.min_time / 20, 3),
+                    "parse": measure(lambda: parser.parse(query), args.min_time / 20, 3),
+                }
+            )
+        lex = sum(q["lex"] for q in results["queries"])
+        parse = sum(q["parse"] for q in results["queries"])
+        print(
+            f"{len(data_list)} queries one by one: lex {lex * 1e3:.3f} ms,"
+            f" parse {parse * 1e3:.3f} ms"
+        )
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against baseline; return the regressed case names."""
+    regressed = []
+    print(f"\ncompared with baseline (threshold +{threshold:.0%}):")
+    for name, seconds in results["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            print(f"  {name:22} new")
+            continue
+        change = seconds / before - 1
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:22} {change:+8.1%}{flag}")
+    before = {q["query"]: q for q in baseline.get("queries", [])}
+    slower = []
+    for query in results["queries"]:
+        old = before.get(query["query"])
+        if old is not None:
+            change = query["parse"] / old["parse"] - 1
+            if change > threshold:
+                slower.append((change, query["query"]))
+    if slower:
+        slower.sort(reverse=True)
+        print(f"  {len(slower)} queries parse more than {threshold:.0%} slower, e.g.:")
+        for change, query in slower[:5]:
+            print(f"    {change:+8.1%}  {query[:70]}")
+    return regressed
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument(
+        "--cases",
+        nargs="+",
+        default=["*"],
+        metavar="PATTERN",
+        help="Run the cases matching these glob patterns (default: all)",
+    )
+    args.add_argument("--min-time", type=float, default=0.2, help="Seconds per sample")
+    args.add_argument("--repeat", type=int, default=5, help="Samples per case")
+    args.add_argument(
+        "--no-queries",
+        dest="queries",
+        action="store_false",
+        help="Skip timing each query of data_list on its own",
+    )
+    args.add_argument("--json", metavar="FILE", help="Write the results to FILE")
+    args.add_argument("--baseline", metavar="FILE", help="Compare with a --json file")
+    args.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown that counts as a regression (default: 0.25 = 25%%)",
+    )
+    args = args.parse_args()
+
+    results = run(args)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} regressed: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,33 @@
-from .pcypher import CypherLexer, CypherParser
+import importlib
+
+# Public names and the submodules defining them.  They are imported on first
+# access through __getattr__, so ``import pcypher`` stays cheap and tools
+# that only need, say, CypherSyntaxError or RESERVED never load the parser.
+_EXPORTS = {
+    "CypherLexer": ".pcypher",
+    "CypherParser": ".pcypher",
+    "CypherSyntaxError": ".errors",
+    "RESERVED": ".pcypher",
+    "get_parser": ".pcypher",
+}
 
 __all__ = [
     "CypherLexer",
     "CypherParser",
+    "CypherSyntaxError",
+    "RESERVED",
+    "get_parser",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,125 @@
+import asyncio
+import concurrent.futures
+import os
+
+from . import pcypher
+from .pcypher import CypherParser
+
+# Executors AsyncCypherParser can run parses on; see AsyncCypherParser.__init__().
+EXECUTORS = ("thread", "process")
+
+
+class AsyncCypherParser:
+    """
+    asyncio front end to CypherParser that keeps long parses off the event
+    loop.
+
+    Usage::
+
+        async with AsyncCypherParser(max_in_flight=8) as parser:
+            result = await parser.parse(query)
+    """
+
+    def __init__(
+        self,
+        executor="thread",
+        workers=None,
+        max_in_flight=None,
+        inline_limit=1024,
+        **options,
+    ):
+        """
+        Build the parser and its executor.
+
+        ``executor`` is "thread" (a ThreadPoolExecutor sharing one
+        thread-safe CypherParser) or "process" (a ProcessPoolExecutor whose
+        workers each build their own; use it when parses must not compete
+        for the GIL).  ``workers`` sizes the pool; if it is None, the size
+        the executor would pick by default.
+
+        At most ``max_in_flight`` parses (default: one per worker, or the
+        pool's default size) run or wait in the executor at once; further
+        parse() calls wait for a free slot.  A slot is released only when
+        its parse actually finishes, so cancelled callers cannot pile work
+        up behind the limit.
+
+        Queries of at most ``inline_limit`` characters are parsed directly
+        on the event loop, which is cheaper than a hand-off for short ones.
+
+        Remaining keyword arguments are CypherParser options, such as
+        ``on_error`` or ``cache_size``; the parser is always optimized.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, not {executor!r}")
+        self.parser = CypherParser(optimize=True, **options)
+        if workers is None:
+            # The defaults of ThreadPoolExecutor and ProcessPoolExecutor.
+            cpus = os.cpu_count() or 1
+            workers = min(32, cpus + 4) if executor == "thread" else cpus
+        self.workers = workers
+        if executor == "thread":
+            self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+            self._call = self.parser.parse
+        else:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                workers,
+                initializer=pcypher._init_worker,
+                initargs=(self.parser._options,),
+            )
+            self._call = _parse_in_worker
+        if max_in_flight is None:
+            max_in_flight = workers
+        self.max_in_flight = max_in_flight
+        self.inline_limit = inline_limit
+        # Created on first use inside each event loop that calls parse().
+        self._loop = self._slots = None
+
+    async def parse(self, data):
+        """
+        Parse data like CypherParser.parse(), on the executor unless it is
+        short enough for the inline path.
+
+        Cancelling the awaiting task withdraws a parse that has not started
+        yet; one already running finishes in the background and its result
+        is dropped.
+        """
+        if len(getattr(data, "text", data)) <= self.inline_limit:
+            return self.parser.parse(data)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        await self._slots.acquire()
+        try:
+            future = self._executor.submit(self._call, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._releaser(loop))
+        return await asyncio.wrap_future(future)
+
+    def _releaser(self, loop):
+        """Return a done callback giving the slot back on the event loop."""
+        slots = self._slots
+
+        def release(future):
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                pass  # The loop is closed; nobody is waiting any more.
+
+        return release
+
+    def close(self, wait=True):
+        """Shut the executor down; parses still queued are cancelled."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def _parse_in_worker(data):
+    return pcypher._worker_parser.parse(data)
@@ -0,0 +1,269 @@
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    ["hits", "misses", "evictions", "maxsize", "currsize", "maxbytes", "currbytes"],
+)
+
+# Returned by ParseCache.get() when the key is not cached (None is a valid AST).
+MISSING = object()
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class FrozenList(list):
+    """
+    List that rejects mutation.
+
+    It still compares, prints and serializes like the list it replaces, so
+    frozen parse results look exactly like regular ones.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+class FrozenDict(dict):
+    """
+    Dict that rejects mutation, the dict counterpart of FrozenList.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def freeze(node):
+    """Return a deep copy of a parse result that cannot be modified."""
+    if not isinstance(node, (tuple, list, dict)):
+        return node
+    # Frames: [container, items, next item, frozen items].  An explicit
+    # stack keeps deep results (long AND chains) off the recursion limit.
+    stack = [[node, _items(node), 0, []]]
+    while True:
+        frame = stack[-1]
+        _, items, i, frozen = frame
+        while i < len(items):
+            item = items[i]
+            i += 1
+            if isinstance(item, (tuple, list, dict)):
+                frame[2] = i
+                stack.append([item, _items(item), 0, []])
+                break
+            frozen.append(item)
+        else:
+            stack.pop()
+            node = _rebuild(frame[0], frozen)
+            if not stack:
+                return node
+            stack[-1][3].append(node)
+
+
+def _items(node):
+    """Return the children of a container; a dict's as key, value, ..."""
+    if isinstance(node, dict):
+        return [part for pair in node.items() for part in pair]
+    return node
+
+
+def _values(node):
+    """Return the children of a container that can hold a Slot."""
+    if isinstance(node, dict):
+        return list(node.values())
+    return node
+
+
+def _rebuild(node, items):
+    """Return the frozen counterpart of container node holding items."""
+    if isinstance(node, tuple):
+        return tuple(items)
+    if isinstance(node, list):
+        return FrozenList(items)
+    return FrozenDict(zip(items[0::2], items[1::2]))
+
+
+def sizeof(node):
+    """Approximate the memory held by a parse result, in bytes."""
+    size = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        size += sys.getsizeof(node)
+        if isinstance(node, (tuple, list)):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            for pair in node.items():
+                stack.extend(pair)
+    return size
+
+
+class ParseCache:
+    """
+    Thread-safe LRU cache of parse results keyed on the query.
+
+    Entries are evicted least recently used first once either ``maxsize``
+    entries or ``maxbytes`` bytes (as estimated by sizeof()) are exceeded.
+    Either limit may be None to leave it unbounded.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._bytes = 0
+
+    def get(self, key):
+        """Return the cached value for key, or MISSING."""
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key, evicting old entries to stay within limits."""
+        size = sizeof(key) + sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while (
+                self.maxsize is not None and len(self._entries) > self.maxsize
+            ) or (self.maxbytes is not None and self._bytes > self.maxbytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def info(self):
+        """Return hit, miss, eviction and memory statistics."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+                self.maxbytes,
+                self._bytes,
+            )
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = self._bytes = 0
+
+
+class Slot:
+    """
+    Placeholder for the index-th NUMBER or STRING literal of a query.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    def __repr__(self):
+        return f"Slot({self.index})"
+
+
+class QueryTemplate:
+    """
+    Frozen parse result of a query shape, with Slot objects where the
+    literals were.
+
+    fill() only rebuilds the containers on the path to a Slot; every other
+    subtree is shared between the template and the results, which is safe
+    because all of them are frozen.
+    """
+
+    __slots__ = ("ast", "_dirty")
+
+    def __init__(self, ast):
+        self.ast = ast
+        self._dirty = set()
+        self._mark(ast)
+
+    def _mark(self, ast):
+        """Record the id() of every container holding a Slot below it."""
+        dirty = self._dirty
+        if not isinstance(ast, (tuple, list, dict)):
+            return
+        # Frames: [container, children, next child].  The stack is the path
+        # from the root, so a Slot dirties the frames on it, up to the
+        # first already marked (whose ancestors are marked too).
+        stack = [[ast, _values(ast), 0]]
+        while stack:
+            frame = stack[-1]
+            _, children, i = frame
+            if i == len(children):
+                stack.pop()
+                continue
+            frame[2] = i + 1
+            child = children[i]
+            if isinstance(child, Slot):
+                for ancestor in reversed(stack):
+                    if id(ancestor[0]) in dirty:
+                        break
+                    dirty.add(id(ancestor[0]))
+            elif isinstance(child, (tuple, list, dict)):
+                stack.append([child, _values(child), 0])
+
+    def fill(self, literals):
+        """Return the parse result with the given literal values in place."""
+        return self._fill(self.ast, literals)
+
+    def _fill(self, node, literals):
+        if isinstance(node, Slot):
+            return literals[node.index]
+        dirty = self._dirty
+        if id(node) not in dirty:
+            return node
+        # Frames as in freeze(); clean subtrees are shared, not walked.
+        stack = [[node, _items(node), 0, []]]
+        while True:
+            frame = stack[-1]
+            _, items, i, filled = frame
+            while i < len(items):
+                item = items[i]
+                i += 1
+                if isinstance(item, Slot):
+                    filled.append(literals[item.index])
+                elif id(item) in dirty:
+                    frame[2] = i
+                    stack.append([item, _items(item), 0, []])
+                    break
+                else:
+                    filled.append(item)
+            else:
+                stack.pop()
+                node = _rebuild(frame[0], filled)
+                if not stack:
+                    return node
+                stack[-1][3].append(node)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sizeof(self.ast) + sizeof(self._dirty)
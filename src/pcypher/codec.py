@@ -0,0 +1,244 @@
+import struct
+
+# Binary encoding of parse results.
+#
+# An encoded result is MAGIC, a string table, the varint byte length of
+# the encoded value and the value.  The string table is a varint count
+# followed by each distinct string as a varint byte length and its UTF-8
+# bytes; every str in the value refers to it by index, so repeated
+# identifiers, labels, property keys and tags are stored once.  The length
+# tells a truncated value, which may still decode, from a complete one.
+#
+# The value is written in postfix order: the items of a container come
+# first and the container's tag last, so loads() rebuilds it from a slice
+# of its value stack.  Each value starts with one tag byte:
+#
+#   0x00 None, 0x01 False, 0x02 True
+#   0x03 int >= 0 as a varint, 0x04 int < 0 as the varint of -1 - n
+#   0x05 float as an 8-byte little-endian double
+#   0x06 str as a varint table index
+#   0x07 tuple, 0x08 list, 0x09 dict of a varint number of items
+#        (dict items are key, value pairs)
+#   0x10-0x1f tuple, 0x20-0x2f list of length tag & 0x0f
+#   0x30-0x3f int 0-15
+#   0x40-0xff str with table index tag - 0x40
+#
+# Varints are unsigned LEB128: 7 bits per byte, low bits first, high bit
+# set on every byte but the last.
+
+MAGIC = b"PCY\x02"
+
+_NONE, _FALSE, _TRUE, _INT, _NEG, _FLOAT, _STR, _TUPLE, _LIST, _DICT = range(10)
+_SMALL_TUPLE = 0x10
+_SMALL_LIST = 0x20
+_SMALL_INT = 0x30
+_SMALL_STR = 0x40
+
+_DOUBLE = struct.Struct("<d")
+
+
+class _Tag(bytes):
+    """The encoded tag of a container, pushed on dumps()'s stack."""
+
+    __slots__ = ()
+
+
+# The one-byte tags of small tuples and lists, by tag value.
+_SMALL_TAGS = {tag: _Tag([tag]) for tag in range(_SMALL_TUPLE, _SMALL_INT)}
+
+# Marks the tags of loads()'s constant table that are not constants.
+_OPCODE = object()
+
+
+def _varint(n, out):
+    while n > 0x7F:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def dumps(ast):
+    """
+    Encode a parse result as bytes.
+
+    Accepts what CypherParser.parse() returns with the default tuple AST,
+    including frozen results from the cache: tuples, lists and dicts of
+    str, int, float, bool and None.  Raises TypeError for anything else.
+    """
+    strings = {}
+    body = bytearray()
+    # Values still to encode, last first.  A container is replaced by its
+    # items followed by its encoded tag, a _Tag written once they are done.
+    stack = [ast]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        cls = node.__class__
+        if cls is str:
+            index = strings.setdefault(node, len(strings))
+            if index < 0x100 - _SMALL_STR:
+                body.append(_SMALL_STR + index)
+            else:
+                body.append(_STR)
+                _varint(index, body)
+        elif cls is _Tag:
+            body += node
+        elif node is None:
+            body.append(_NONE)
+        elif node is True:
+            body.append(_TRUE)
+        elif node is False:
+            body.append(_FALSE)
+        elif isinstance(node, (tuple, list)):
+            n = len(node)
+            small = _SMALL_TUPLE if isinstance(node, tuple) else _SMALL_LIST
+            if n < 16:
+                push(_SMALL_TAGS[small + n])
+            else:
+                tag = bytearray([_TUPLE if small == _SMALL_TUPLE else _LIST])
+                _varint(n, tag)
+                push(_Tag(tag))
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            tag = bytearray([_DICT])
+            _varint(len(node), tag)
+            push(_Tag(tag))
+            for key, value in reversed(node.items()):
+                push(value)
+                push(key)
+        elif isinstance(node, int):
+            if 0 <= node < 16:
+                body.append(_SMALL_INT + node)
+            elif node >= 0:
+                body.append(_INT)
+                _varint(node, body)
+            else:
+                body.append(_NEG)
+                _varint(-1 - node, body)
+        elif isinstance(node, float):
+            body.append(_FLOAT)
+            body.extend(_DOUBLE.pack(node))
+        else:
+            raise TypeError(f"cannot encode {type(node).__name__} in a parse result")
+
+    out = bytearray(MAGIC)
+    _varint(len(strings), out)
+    for string in strings:
+        data = string.encode()
+        _varint(len(data), out)
+        out += data
+    _varint(len(body), out)
+    out += body
+    return bytes(out)
+
+
+def loads(data):
+    """
+    Decode bytes made by dumps() back into the parse result.
+
+    Raises ValueError for anything else, including truncated data.
+    """
+    data = bytes(data)
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError("not an encoded pcypher parse result")
+    try:
+        return _decode(data)
+    except (IndexError, struct.error):
+        # A varint, string index or float running past what data holds.
+        raise ValueError("truncated or corrupt encoded parse result") from None
+
+
+def _decode(data):
+    pos = len(MAGIC)
+
+    def varint():
+        nonlocal pos
+        n = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            n |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return n
+            shift += 7
+
+    strings = []
+    for _ in range(varint()):
+        size = varint()
+        if pos + size > len(data):
+            raise ValueError("truncated encoded parse result")
+        strings.append(data[pos : pos + size].decode())
+        pos += size
+    size = varint()
+    if pos + size != len(data):
+        raise ValueError("truncated encoded parse result")
+
+    # Tags that stand for a value by themselves decode with one lookup.
+    constants = [_OPCODE] * 0x100
+    constants[_NONE] = None
+    constants[_FALSE] = False
+    constants[_TRUE] = True
+    constants[_SMALL_INT : _SMALL_INT + 16] = range(16)
+    small = strings[: 0x100 - _SMALL_STR]
+    constants[_SMALL_STR : _SMALL_STR + len(small)] = small
+
+    stack = []
+    push = stack.append
+    end = len(data)
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        value = constants[tag]
+        if value is not _OPCODE:
+            push(value)
+        elif tag >= _SMALL_INT:
+            # Small ints are all constants: a string past the table.
+            raise ValueError(f"unknown string index at offset {pos - 1}")
+        elif tag >= _SMALL_LIST:
+            n = tag - _SMALL_LIST
+            if n > len(stack):
+                raise ValueError(f"missing list items at offset {pos - 1}")
+            if n:
+                value = stack[-n:]
+                del stack[-n:]
+                push(value)
+            else:
+                push([])
+        elif tag >= _SMALL_TUPLE:
+            n = tag - _SMALL_TUPLE
+            if n > len(stack):
+                raise ValueError(f"missing tuple items at offset {pos - 1}")
+            if n:
+                value = tuple(stack[-n:])
+                del stack[-n:]
+                push(value)
+            else:
+                push(())
+        elif tag == _STR:
+            push(strings[varint()])
+        elif tag == _TUPLE or tag == _LIST or tag == _DICT:
+            n = varint() * (2 if tag == _DICT else 1)
+            start = len(stack) - n
+            if start < 0:
+                raise ValueError(f"missing container items at offset {pos - 1}")
+            items = stack[start:]
+            del stack[start:]
+            if tag == _TUPLE:
+                push(tuple(items))
+            elif tag == _LIST:
+                push(items)
+            else:
+                push(dict(zip(items[::2], items[1::2])))
+        elif tag == _INT:
+            push(varint())
+        elif tag == _NEG:
+            push(-1 - varint())
+        elif tag == _FLOAT:
+            push(_DOUBLE.unpack_from(data, pos)[0])
+            pos += 8
+        else:
+            raise ValueError(f"unknown tag 0x{tag:02x} at offset {pos - 1}")
+    if len(stack) != 1:
+        raise ValueError("malformed encoded parse result")
+    return stack[0]
@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+
+from .jsonstream import read_json, write_json
+
+# Newline-delimited JSON protocol.  Each request line is {"query": text},
+# optionally with "format": "json".  Each response line is
+# {"result": ..., "errors": [message, ...]}: result is str() of the parse
+# result, or with the "json" format the parse result itself, and null when
+# the query did not parse.  errors holds what a local run would report:
+# the lines a printing parser writes with the default "repr" format, and
+# str() of each CypherSyntaxError with "json".  A malformed request, or one
+# asking for an unknown format, gets {"error": message}.  A connection may
+# carry any number of requests, answered in order.
+
+# Result formats a request can ask for.
+FORMATS = ("repr", "json")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        parser = self.server.parser
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                format = request.get("format", "repr")
+                if format not in FORMATS:
+                    raise ValueError(
+                        f"format must be one of {FORMATS}, not {format!r}"
+                    )
+                if format == "repr":
+                    # Parse in "print" mode, keeping the lines it would print.
+                    messages = []
+                    result, _ = parser._parse(request["query"], messages.append)
+                    if result is not None:
+                        result = str(result)
+                else:
+                    result, errors = parser.parse_with_errors(request["query"])
+                    messages = [str(e) for e in errors]
+                # write_json() rather than json.dumps(), which recurses
+                # once per level of the result.
+                out = io.StringIO()
+                write_json({"result": result, "errors": messages}, out)
+                response = out.getvalue()
+            except Exception as e:
+                response = json.dumps({"error": f"{type(e).__name__}: {e}"})
+            self.wfile.write(response.encode() + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve(path, parser=None):
+    """
+    Answer parse requests on the Unix socket at ``path`` until interrupted.
+
+    Every connection is served on its own thread by one shared parser,
+    ``get_parser()`` unless given.  A stale socket file left at ``path`` is
+    replaced; any other existing file is an error.
+    """
+    if parser is None:
+        from .pcypher import get_parser
+
+        parser = get_parser()
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    with _Server(path, _Handler) as server:
+        server.parser = parser
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+class Client:
+    """
+    Connection to a ``pcypher serve`` daemon.
+
+    parse() sends one query and returns the response dict; the connection
+    stays open for further queries until close().
+    """
+
+    def __init__(self, path):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+        self._file = self._sock.makefile("rwb")
+
+    def parse(self, query, format="repr"):
+        """
+        Return ``{"result": ..., "errors": [...]}`` for query; the result is
+        str() of the parse result, or with ``format="json"`` the result with
+        tuples turned into lists.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, not {format!r}")
+        request = {"query": query}
+        if format != "repr":
+            request["format"] = format
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("pcypher daemon closed the connection")
+        try:
+            response = json.loads(line)
+        except RecursionError:
+            # A result too deep for the json module, which is much faster
+            # on everything else.
+            response = read_json(line.decode())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
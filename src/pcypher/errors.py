@@ -0,0 +1,58 @@
+class CypherSyntaxError(Exception):
+    """
+    A syntax error found while lexing or parsing a query.
+
+    ``line`` and ``column`` are 1-based and point at ``token``, the offending
+    text (None at end of input).  ``expected`` lists the token types the
+    parser could have accepted there; it is None for lexer errors.  Batch
+    APIs return these in place of the result of the failing query.
+    """
+
+    def __init__(
+        self,
+        message,
+        query=None,
+        line=None,
+        column=None,
+        token=None,
+        expected=None,
+        lexpos=None,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.query = query
+        self.line = line
+        self.column = column
+        self.token = token
+        self.expected = expected
+        self.lexpos = lexpos
+
+    @classmethod
+    def at(cls, message, query, lexpos, token=None, expected=None):
+        """Return the error found at offset ``lexpos`` of query."""
+        data = query or ""
+        return cls(
+            message,
+            query,
+            line=data.count("\n", 0, lexpos) + 1,
+            column=lexpos - data.rfind("\n", 0, lexpos),
+            token=token,
+            expected=expected,
+            lexpos=lexpos,
+        )
+
+    def __str__(self):
+        if self.line is None:
+            return self.message
+        return f"{self.message} (line {self.line}, column {self.column})"
+
+    def __reduce__(self):
+        return type(self), (
+            self.message,
+            self.query,
+            self.line,
+            self.column,
+            self.token,
+            self.expected,
+            self.lexpos,
+        )
@@ -0,0 +1,155 @@
+import functools
+import re
+
+from .pcypher import RESERVED, CypherLexer
+from .tokens import Token
+
+
+# CypherLexer's string rules by token type; all of them are literals.
+_STRINGS = {
+    name[2:]: value
+    for name, value in vars(CypherLexer).items()
+    if name.startswith("t_") and isinstance(value, str) and name != "t_ignore"
+}
+
+
+def _literal(regex):
+    """Return the text a literal string rule such as r"\\+=" matches."""
+    return re.sub(r"\\(.)", r"\1", regex)
+
+
+def _rules():
+    """
+    Return ``(group, regex)`` pairs in the order PLY tries CypherLexer's
+    rules: function rules as defined, then string rules, longest first.
+
+    The string rules share one PUNCT group, the
+    multi-character ones first and the rest as a character class, so the
+    regex engine tests them in one step.
+    """
+    funcs = sorted(
+        (
+            value
+            for name, value in vars(CypherLexer).items()
+            if name.startswith("t_") and callable(value) and name != "t_error"
+        ),
+        key=lambda func: func.__code__.co_firstlineno,
+    )
+    strings = sorted(sorted(_STRINGS.values()), key=len, reverse=True)
+
+    rules = []
+    for func in funcs:
+        name = func.__name__[2:]
+        if name == "NUMBER":
+            # Split so the match itself tells an integer from a float.
+            rules.append(("FLOAT", r"\d+\.\d+"))
+            rules.append(("INTEGER", r"\d+"))
+        else:
+            rules.append((name, func.__doc__))
+    longer = [regex for regex in strings if len(_literal(regex)) > 1]
+    single = "".join(re.escape(_literal(regex)) for regex in strings if regex not in longer)
+    rules.append(("PUNCT", "|".join(longer + [f"[{single}]"])))
+    ignore = re.escape(CypherLexer.t_ignore)
+    return rules + [("error", f"[^{ignore}\\n]")]
+
+
+# One pattern for the whole scanner: leading blanks (t_ignore) are consumed
+# by the match itself, and the final alternative catches illegal characters,
+# so consecutive matches of finditer() cover the input up to trailing blanks.
+_MASTER = re.compile(
+    "[%s]*(?:%s)"
+    % (
+        re.escape(CypherLexer.t_ignore),
+        "|".join(f"(?P<{name}>{regex})" for name, regex in _rules()),
+    ),
+    re.VERBOSE,
+)
+
+# Token type of each text matched by PUNCT.
+_PUNCT = {_literal(regex): type for type, regex in _STRINGS.items()}
+
+# Rule groups whose token type is the group name and whose value is the
+# matched text.
+_VERBATIM = ("ENDS_WITH", "STARTS_WITH", "IS_NOT_NULL", "IS_NULL")
+
+# Token type of each identifier spelling seen so far, so the common case is
+# one dict lookup instead of lower() plus a RESERVED lookup.
+_KINDS = {}
+_KINDS_LIMIT = 4096
+
+
+class FastLexer:
+    """
+    Drop-in replacement for the PLY lexer built by CypherLexer.
+
+    Produces the same token types, values, line numbers and positions, and
+    reports illegal characters the same way, from one regex scan per input
+    with a single dispatch on the matched group.
+    """
+
+    def __init__(self):
+        self.lineno = 1
+        self.lexpos = 0
+        self.token = functools.partial(next, iter(()), None)
+
+    def clone(self):
+        """Return a new lexer; all scanner state is per instance."""
+        return FastLexer()
+
+    def input(self, data):
+        """
+        Start lexing data; token() then returns its tokens one by one.
+
+        As with PLY, setting ``lexpos`` before the first token() call starts
+        the scan at that offset instead of 0.
+        """
+        self.lexpos = 0
+        self.token = functools.partial(next, self._scan(data), None)
+
+    def _scan(self, data):
+        punct = _PUNCT
+        kinds = _KINDS
+        for m in _MASTER.finditer(data, self.lexpos):
+            kind = m.lastgroup
+            # Like PLY's lexpos: the end of the last token returned.
+            self.lexpos = m.end()
+            if kind == "IDENTIFIER":
+                value = m.group(kind)
+                type = kinds.get(value)
+                if type is None:
+                    type = RESERVED.get(value.lower(), "IDENTIFIER")
+                    if len(kinds) < _KINDS_LIMIT:
+                        kinds[value] = type
+                yield Token(type, value, self.lineno, m.start(kind))
+            elif kind == "PUNCT":
+                value = m.group(kind)
+                yield Token(punct[value], value, self.lineno, m.start(kind))
+            elif kind == "STRING":
+                yield Token(kind, m.group(kind)[1:-1], self.lineno, m.start(kind))
+            elif kind == "INTEGER":
+                yield Token("NUMBER", int(m.group(kind)), self.lineno, m.start(kind))
+            elif kind == "FLOAT":
+                yield Token("NUMBER", float(m.group(kind)), self.lineno, m.start(kind))
+            elif kind == "PARAM":
+                yield Token(kind, m.group(kind)[1:], self.lineno, m.start(kind))
+            elif kind == "BACKTICK_IDENTIFIER":
+                value = m.group(kind)[1:-1]
+                yield Token("IDENTIFIER", value, self.lineno, m.start(kind))
+            elif kind == "newline":
+                self.lineno += m.end() - m.start(kind)
+            elif kind == "BLOCK_COMMENT":
+                self.lineno += m.group(kind).count("\n")
+            elif kind in _VERBATIM:
+                yield Token(kind, m.group(kind), self.lineno, m.start(kind))
+            elif kind == "error":
+                self._illegal(m.group(kind), m.start(kind))
+            # COMMENT: skipped.
+
+    def _illegal(self, char, lexpos):
+        """Report an illegal character as CypherLexer.t_error() does."""
+        message = f"Illegal character '{char}'"
+        state = getattr(self, "parse_state", None)
+        if state is None:
+            print(message)
+        else:
+            state.error(message, lexpos, char)
@@ -0,0 +1,345 @@
+import math
+
+from .visitor import Transformer
+
+# Constant folding works on the values a parse result can hold for sure:
+# numbers, booleans, null and list literals of them.  String literals are
+# plain str like identifiers ("RETURN 'x'" and "RETURN x" parse alike), so
+# string expressions and string functions are never folded.
+#
+# Folded values follow Cypher, not Python: integer division and modulo
+# truncate toward zero, ^ always yields a float, comparisons with null
+# yield null, and an expression that would raise an error (division by
+# zero, integer overflow, a wrong argument type) or produce NaN or
+# infinity, which have no literal, is left as it is.
+
+_INT_MIN = -(2**63)
+_INT_MAX = 2**63 - 1
+
+# Longest list range() may be folded into; longer ones stay calls.
+_MAX_RANGE = 1000
+
+
+class _NoFold(Exception):
+    """Raised while evaluating an expression that must stay unfolded."""
+
+
+def _is_number(value):
+    return value.__class__ is int or value.__class__ is float
+
+
+def _is_boolean(value):
+    return value.__class__ is bool or value is None
+
+
+def _is_list(value):
+    return value.__class__ is tuple and len(value) == 2 and value[0] == "list"
+
+
+def _is_constant(value):
+    cls = value.__class__
+    if cls is int or cls is float or cls is bool or value is None:
+        return True
+    return (
+        _is_list(value)
+        and isinstance(value[1], list)
+        and all(_is_constant(item) for item in value[1])
+    )
+
+
+def _number(value):
+    if not _is_number(value):
+        raise _NoFold()
+    return value
+
+
+def _integer(value):
+    if value.__class__ is not int:
+        raise _NoFold()
+    return value
+
+
+def _items(value):
+    if not _is_list(value) or not isinstance(value[1], list):
+        raise _NoFold()
+    return value[1]
+
+
+def _checked(value):
+    """Return value if it has a literal form within Cypher's ranges."""
+    if value.__class__ is int and not _INT_MIN <= value <= _INT_MAX:
+        raise _NoFold()
+    if value.__class__ is float and (math.isnan(value) or math.isinf(value)):
+        raise _NoFold()
+    return value
+
+
+def _divide(left, right):
+    if right == 0:
+        raise _NoFold()
+    if left.__class__ is int and right.__class__ is int:
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    return left / right
+
+
+def _modulo(left, right):
+    if right == 0:
+        raise _NoFold()
+    if left.__class__ is int and right.__class__ is int:
+        remainder = abs(left) % abs(right)
+        return remainder if left >= 0 else -remainder
+    return math.fmod(left, right)
+
+
+def _power(left, right):
+    try:
+        return math.pow(left, right)
+    except (OverflowError, ValueError):
+        raise _NoFold() from None
+
+
+_ARITHMETIC = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": _divide,
+    "%": _modulo,
+    "^": _power,
+}
+
+_COMPARISON = {
+    "=": lambda a, b: a == b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _math(func):
+    """Wrap a one-argument math function taking and returning numbers."""
+
+    def apply(value):
+        try:
+            return float(func(_number(value)))
+        except (OverflowError, ValueError, ZeroDivisionError):
+            raise _NoFold() from None
+
+    return apply
+
+
+def _range(start, end, step=1):
+    start, end, step = _integer(start), _integer(end), _integer(step)
+    if step == 0:
+        raise _NoFold()
+    values = range(start, end + (1 if step > 0 else -1), step)
+    if len(values) > _MAX_RANGE:
+        raise _NoFold()
+    return ("list", list(values))
+
+
+def _round(value):
+    value = _number(value)
+    # Cypher rounds half up, toward positive infinity.
+    return float(math.floor(value + 0.5))
+
+
+def _sign(value):
+    value = _number(value)
+    return (value > 0) - (value < 0)
+
+
+def _to_integer(value):
+    if value is None:
+        return None
+    return int(_number(value))
+
+
+def _to_float(value):
+    if value is None:
+        return None
+    return float(_number(value))
+
+
+def _head(value):
+    items = _items(value)
+    return items[0] if items else None
+
+
+def _last(value):
+    items = _items(value)
+    return items[-1] if items else None
+
+
+# Pure built-in functions by lower-cased name: (argument counts, function).
+# A null argument makes every one of them return null.
+_FUNCTIONS = {
+    "abs": ((1,), lambda v: abs(_number(v))),
+    "ceil": ((1,), _math(math.ceil)),
+    "floor": ((1,), _math(math.floor)),
+    "round": ((1,), _round),
+    "sign": ((1,), _sign),
+    "sqrt": ((1,), _math(math.sqrt)),
+    "exp": ((1,), _math(math.exp)),
+    "log": ((1,), _math(math.log)),
+    "log10": ((1,), _math(math.log10)),
+    "sin": ((1,), _math(math.sin)),
+    "cos": ((1,), _math(math.cos)),
+    "tan": ((1,), _math(math.tan)),
+    "cot": ((1,), _math(lambda v: 1 / math.tan(v))),
+    "asin": ((1,), _math(math.asin)),
+    "acos": ((1,), _math(math.acos)),
+    "atan": ((1,), _math(math.atan)),
+    "atan2": ((2,), lambda y, x: math.atan2(_number(y), _number(x))),
+    "degrees": ((1,), _math(math.degrees)),
+    "radians": ((1,), _math(math.radians)),
+    "haversin": ((1,), _math(lambda v: (1 - math.cos(v)) / 2)),
+    "pi": ((0,), lambda: math.pi),
+    "e": ((0,), lambda: math.e),
+    "tointeger": ((1,), _to_integer),
+    "tofloat": ((1,), _to_float),
+    "range": ((2, 3), _range),
+    "size": ((1,), lambda v: len(_items(v))),
+    "head": ((1,), _head),
+    "last": ((1,), _last),
+    "tail": ((1,), lambda v: ("list", _items(v)[1:])),
+    "reverse": ((1,), lambda v: ("list", _items(v)[::-1])),
+}
+
+
+def _count(value):
+    """
+    Count the tagged tuples of a constant value, or of a plain list of them
+    such as the arguments of a function call.
+    """
+    if _is_list(value):
+        return 1 + _count(value[1])
+    if value.__class__ is list:
+        return sum(_count(item) for item in value)
+    return 0
+
+
+class ConstantFolder(Transformer):
+    """
+    Transformer folding constant expressions; see fold().
+
+    ``eliminated`` counts the tagged tuples removed so far.
+    """
+
+    def __init__(self):
+        self.eliminated = 0
+
+    def _fold(self, node, compute):
+        """Replace node by compute()'s value unless it must stay unfolded."""
+        try:
+            value = _checked(compute())
+        except _NoFold:
+            return node
+        self.eliminated += 1 + sum(_count(item) for item in node[1:]) - _count(value)
+        return value
+
+    def transform_binop(self, node):
+        _, op, left, right = node
+        if not (_is_constant(left) and _is_constant(right)):
+            return node
+        if op in _ARITHMETIC:
+            if left is None or right is None:
+                return self._fold(node, lambda: None)
+            if _is_number(left) and _is_number(right):
+                return self._fold(node, lambda: _ARITHMETIC[op](left, right))
+        elif op in _COMPARISON:
+            if left is None or right is None:
+                return self._fold(node, lambda: None)
+            if _is_number(left) and _is_number(right):
+                return self._fold(node, lambda: _COMPARISON[op](left, right))
+            if op == "=" and left.__class__ is bool and right.__class__ is bool:
+                return self._fold(node, lambda: left == right)
+        return node
+
+    def transform_logical(self, node):
+        _, op, left, right = node
+        if not (_is_boolean(left) and _is_boolean(right)):
+            return node
+        if op == "AND":
+            if left is False or right is False:
+                return self._fold(node, lambda: False)
+            value = None if left is None or right is None else True
+        elif op == "OR":
+            if left is True or right is True:
+                return self._fold(node, lambda: True)
+            value = None if left is None or right is None else False
+        else:
+            value = None if left is None or right is None else left != right
+        return self._fold(node, lambda: value)
+
+    def transform_not(self, node):
+        operand = node[1]
+        if operand is None or operand.__class__ is bool:
+            return self._fold(node, lambda: None if operand is None else not operand)
+        if operand.__class__ is tuple and operand and operand[0] == "not":
+            self.eliminated += 2
+            return operand[1]
+        return node
+
+    def transform_uminus(self, node):
+        operand = node[1]
+        if operand is None or _is_number(operand):
+            return self._fold(node, lambda: None if operand is None else -operand)
+        if operand.__class__ is tuple and operand and operand[0] == "uminus":
+            self.eliminated += 2
+            return operand[1]
+        return node
+
+    def transform_func_call(self, node):
+        _, name, arguments = node
+        spec = _FUNCTIONS.get(name.lower()) if isinstance(name, str) else None
+        if spec is None or not isinstance(arguments, list):
+            return node
+        counts, func = spec
+        if len(arguments) not in counts:
+            return node
+        if not all(_is_constant(arg) for arg in arguments):
+            return node
+        if any(arg is None for arg in arguments):
+            return self._fold(node, lambda: None)
+        return self._fold(node, lambda: func(*arguments))
+
+    def transform_index(self, node):
+        _, target, index = node
+        if not (_is_constant(target) and _is_constant(index)):
+            return node
+        if target is None or index is None:
+            return self._fold(node, lambda: None)
+        if not _is_list(target) or index.__class__ is not int:
+            return node
+        items = target[1]
+        if -len(items) <= index < len(items):
+            return self._fold(node, lambda: items[index])
+        return self._fold(node, lambda: None)
+
+    def transform_slice(self, node):
+        _, target, start, end = node
+        if not _is_constant(target) or not _is_list(target):
+            return node
+        # A missing bound and a null bound both parse as None, but only the
+        # first makes the slice open-ended; the second makes it null.
+        if start.__class__ is not int or end.__class__ is not int:
+            return node
+        return self._fold(node, lambda: ("list", target[1][start:end]))
+
+
+def fold(ast):
+    """
+    Fold the constant expressions of a tuple-form parse result.
+
+    Arithmetic, comparison and logical operators, unary minus and pure
+    built-in functions (math functions, range(), size(), head() and the
+    like) over numbers, booleans, null and constant lists are replaced by
+    their value, list literals are indexed and sliced between integer
+    bounds, and double NOT and double unary minus are removed.  Returns ``(result, eliminated)``, the
+    folded tree and the number of tagged tuples it no longer has.
+    """
+    folder = ConstantFolder()
+    result = folder.transform(ast)
+    return result, folder.eliminated
@@ -0,0 +1,327 @@
+from bisect import bisect_left
+
+from .nodes import CLASSES, to_nodes
+from .tokens import Token
+
+# Token types that start a clause (see CypherParser.p_clause and the SKIP
+# and LIMIT clause rules) when they are not nested in parentheses, brackets
+# or braces.  MATCH after OPTIONAL or
+# MANDATORY and DELETE after DETACH continue the clause already started.
+_CLAUSE_STARTS = frozenset(
+    (
+        "MATCH",
+        "OPTIONAL",
+        "MANDATORY",
+        "MERGE",
+        "CREATE",
+        "WITH",
+        "SET",
+        "DELETE",
+        "DETACH",
+        "REMOVE",
+        "CALL",
+        "RETURN",
+        "UNWIND",
+        "ORDER",
+        "SKIP",
+        "LIMIT",
+    )
+)
+_CONTINUES = {"MATCH": ("OPTIONAL", "MANDATORY"), "DELETE": ("DETACH",)}
+_OPEN = frozenset(("LPAREN", "LBRACKET", "LBRACE"))
+_CLOSE = frozenset(("RPAREN", "RBRACKET", "RBRACE"))
+
+
+class IncrementalState:
+    """
+    Result of parsing one version of a text, kept for CypherParser.reparse().
+
+    ``text``, ``result`` and ``errors`` are those of parse_with_errors() on
+    the text.  The state also keeps the text's tokens and the parse of each
+    top-level clause, so that a reparse after an edit only lexes and parses
+    the clauses the edit touched.  States are never modified: reparse()
+    returns a new one, and older states stay valid (e.g. for undo).
+    """
+
+    __slots__ = (
+        "text",
+        "result",
+        "errors",
+        "_types",
+        "_starts",
+        "_ends",
+        "_values",
+        "_segments",
+    )
+
+    def __init__(self, text, result, errors):
+        self.text = text
+        self.result = result
+        self.errors = errors
+        # Token columns; None when the text did not lex cleanly, in which
+        # case the next reparse starts over.
+        self._types = self._starts = self._ends = self._values = None
+        # [(first token, end token, clause result or UNION/UNION_ALL tag)]
+        # covering every token, in order.  The result is None for a clause
+        # that did not parse or was not parsed after one that did not.
+        self._segments = None
+
+    def __repr__(self):
+        return f"IncrementalState({self.text!r}, {self.result!r}, {self.errors!r})"
+
+
+def _lex(parser, text, start, stop_at=None):
+    """
+    Lex text from offset start on a borrowed lexer.
+
+    Returns ``(types, starts, ends, values, errors, sync)``.  With stop_at,
+    a function taking (type, start, end), lexing stops before the first
+    token it accepts, and sync is that token's (type, start, end).
+    """
+    types, starts, ends, values = [], [], [], []
+    sync = None
+    state = parser._acquire()
+    try:
+        state.begin(text, "collect")
+        lexer = state.lexer
+        lexer.input(text)
+        lexer.lexpos = start
+        lexer.lineno = text.count("\n", 0, start) + 1
+        for tok in iter(lexer.token, None):
+            end = lexer.lexpos
+            if stop_at is not None and stop_at(tok.type, tok.lexpos, end):
+                sync = (tok.type, tok.lexpos, end)
+                break
+            types.append(tok.type)
+            starts.append(tok.lexpos)
+            ends.append(end)
+            values.append(tok.value)
+        return types, starts, ends, values, state.errors, sync
+    finally:
+        state.data = None
+        parser._pool.append(state)
+
+
+def _segment(types, first, stop_at=None):
+    """
+    Split types[first:] into top-level clauses and UNION [ALL] separators.
+
+    Returns ``[(first token, end token, tag)]`` where tag is None for a
+    clause and "UNION" or "UNION_ALL" for a separator.  With stop_at,
+    splitting stops at the first clause start it accepts, which is
+    returned as the end of the last segment.
+    """
+    segments = []
+    depth = 0
+    start = first
+    previous = None
+    i = first
+    n = len(types)
+    while i < n:
+        type = types[i]
+        if type in _OPEN:
+            depth += 1
+        elif type in _CLOSE:
+            depth -= 1
+        elif depth == 0:
+            if type == "UNION":
+                if i > start:
+                    segments.append((start, i, None))
+                end = i + 2 if i + 1 < n and types[i + 1] == "ALL" else i + 1
+                segments.append((i, end, "UNION" if end == i + 1 else "UNION_ALL"))
+                start = end
+                previous = types[end - 1]
+                i = end
+                continue
+            if (
+                type in _CLAUSE_STARTS
+                and i > start
+                and previous not in _CONTINUES.get(type, ())
+                # A "CYPHER <version>" header belongs to the first clause.
+                and not (i == 2 and types[0] == "CYPHER")
+            ):
+                segments.append((start, i, None))
+                start = i
+                if stop_at is not None and stop_at(i):
+                    return segments, i
+        previous = type
+        i += 1
+    if start < n or not segments:
+        segments.append((start, n, None))
+    return segments, n
+
+
+def _parse_clause(parser, text, types, starts, values, first, end):
+    """Parse the tokens of one clause; return the clause or None on errors."""
+    lineno = text.count("\n", 0, starts[first]) + 1
+    tokens = []
+    position = starts[first]
+    for i in range(first, end):
+        lineno += text.count("\n", position, starts[i])
+        position = starts[i]
+        tokens.append(Token(types[i], values[i], lineno, position))
+    result, errors = parser._run(text, tokens, "collect")
+    if errors or not isinstance(result, list) or len(result) != 1:
+        return None
+    clause = parser._finish(result[0])
+    if parser._typed_ast:
+        clause = to_nodes(clause)
+    return clause
+
+
+def _separated(segments):
+    """Return whether every UNION [ALL] of segments is between two clauses."""
+    clause = False
+    for _, _, item in segments:
+        separator = item == "UNION" or item == "UNION_ALL"
+        if separator and not clause:
+            return False
+        clause = not separator
+    return clause
+
+
+def _assemble(parser, segments):
+    """Build the parse result from the clauses and separators of segments."""
+    result = []
+    for _, _, item in segments:
+        if item == "UNION" or item == "UNION_ALL":
+            result = (item, result, [])
+        elif isinstance(result, list):
+            result.append(item)
+        else:
+            result[2].append(item)
+    return _unions(parser, result)
+
+
+def _unions(parser, result):
+    """Turn the ("UNION", left, right) tuples of _assemble() into nodes."""
+    if isinstance(result, list) or not parser._typed_ast:
+        return result
+    # Left-nested: walk down the left spine without recursion.
+    spine = []
+    while not isinstance(result, list):
+        spine.append(result)
+        result = result[1]
+    for tag, _, right in reversed(spine):
+        result = CLASSES[tag](result, right)
+    return result
+
+
+def _complete(parser, text):
+    """Return the state of a full parse of text."""
+    result, errors = parser._parse(text, "collect")
+    return IncrementalState(text, result, errors or [])
+
+
+def _build(parser, text, types, starts, ends, values, segments, reuse):
+    """
+    Parse the clauses of segments that reuse() does not supply and return
+    the new state.  If one of them fails, the result and errors are those
+    of a full parse, but the state keeps the clauses parsed before it, so
+    that the next reparse need not start over.
+    """
+    parsed = []
+    failed = False
+    for first, end, item in segments:
+        if item is None:
+            item = reuse(first, end)
+            if item is None and not failed:
+                item = _parse_clause(parser, text, types, starts, values, first, end)
+                failed = item is None
+        parsed.append((first, end, item))
+    if failed or not _separated(parsed):
+        result, errors = parser._parse(text, "collect")
+        state = IncrementalState(text, result, errors or [])
+    else:
+        state = IncrementalState(text, _assemble(parser, parsed), [])
+    state._types, state._starts, state._ends, state._values = types, starts, ends, values
+    state._segments = parsed
+    return state
+
+
+def parse(parser, text):
+    """Parse text from scratch into an IncrementalState."""
+    types, starts, ends, values, errors, _ = _lex(parser, text, 0)
+    if errors or not types:
+        return _complete(parser, text)
+    segments, _ = _segment(types, 0)
+    return _build(parser, text, types, starts, ends, values, segments, lambda a, b: None)
+
+
+def reparse(parser, state, offset, deleted, inserted):
+    """Return the IncrementalState of state.text with one edit applied."""
+    old = state.text
+    if not 0 <= offset <= offset + deleted <= len(old):
+        raise ValueError(
+            f"edit at {offset} deleting {deleted} characters is outside "
+            f"the text of length {len(old)}"
+        )
+    text = old[:offset] + inserted + old[offset + deleted :]
+    if state._segments is None:
+        return parse(parser, text)
+    delta = len(inserted) - deleted
+    types, starts, ends, values = state._types, state._starts, state._ends, state._values
+    segments = state._segments
+    n = len(types)
+
+    # Relex from the start of the clause holding the first token the edit
+    # may change: one ending at or after the edit, as text appended to a
+    # token can extend it.  If that token starts its clause, the previous
+    # token's lookahead may reach it, so start one clause earlier.
+    affected = bisect_left(ends, offset)
+    index = bisect_left([segment[1] for segment in segments], affected + 1)
+    index = min(index, len(segments) - 1)
+    if segments[index][0] >= affected and index > 0:
+        index -= 1
+    restart = segments[index][0]
+
+    # Lexing stops at the first token past the edit that starts and ends
+    # where an old token did (shifted by delta): the rest is unchanged.
+    edited = offset + len(inserted)
+
+    def unchanged(type, start, end):
+        if start < edited:
+            return False
+        j = bisect_left(starts, start - delta)
+        return j < n and starts[j] == start - delta and ends[j] == end - delta and (
+            types[j] == type
+        )
+
+    position = starts[restart] if index else 0
+    new_types, new_starts, new_ends, new_values, errors, sync = _lex(
+        parser, text, position, unchanged
+    )
+    if errors:
+        return _complete(parser, text)
+    tail = n if sync is None else bisect_left(starts, sync[1] - delta)
+    shift = restart + len(new_types) - tail
+    types = types[:restart] + new_types + types[tail:]
+    starts = starts[:restart] + new_starts + [s + delta for s in starts[tail:]]
+    ends = ends[:restart] + new_ends + [e + delta for e in ends[tail:]]
+    values = values[:restart] + new_values + values[tail:]
+    if not types:
+        return _complete(parser, text)
+
+    # Resplit from the restart clause until a clause starts where an old
+    # one did in the unchanged tail; old segments from there on still hold.
+    old_firsts = {first: i for i, (first, _, _) in enumerate(segments)}
+    relexed_end = restart + len(new_types)
+
+    def realigned(i):
+        return i >= relexed_end and i - shift in old_firsts
+
+    middle, stop = _segment(types, restart, realigned)
+    kept = segments[:index]
+    if stop < len(types):
+        later = [
+            (first + shift, end + shift, item)
+            for first, end, item in segments[old_firsts[stop - shift] :]
+        ]
+    else:
+        later = []
+    reused = {(first, end): item for first, end, item in kept + later}
+
+    def reuse(first, end):
+        return reused.get((first, end))
+
+    return _build(parser, text, types, starts, ends, values, kept + middle + later, reuse)
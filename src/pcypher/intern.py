@@ -0,0 +1,174 @@
+from .cache import FrozenDict, FrozenList
+
+
+class Interner:
+    """
+    Hash-consing table for parse results.
+
+    intern() returns a frozen copy of a result in which structurally equal
+    subtrees, such as every ``("node", "adam", [], None)`` of a generated
+    CREATE, are one shared object, and equal strings are one str.  The
+    table persists across calls, so results interned by one Interner share
+    subtrees with each other; clear() empties it.
+
+    hash() gives the structural hash of a node: equal subtrees get equal
+    hashes, in every process and on every run (unlike ``hash()`` of a str),
+    so it can key caches and deduplication outside the process.
+    """
+
+    def __init__(self):
+        # Structural key -> canonical object.  A key holds the class of a
+        # container and, per child, the id() of its canonical object, which
+        # the table keeps alive, or the (class, value) of a scalar leaf.
+        self._table = {}
+        # id() of a canonical container or str -> its structural hash.
+        self._hashes = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        """Forget every interned object."""
+        self._table.clear()
+        self._hashes.clear()
+
+    def intern(self, tree):
+        """Return the canonical, frozen copy of tree."""
+        table = self._table
+        # Frames: [node, children, next child, canonical children, key parts]
+        root = [None, (tree,), 0, [], []]
+        stack = [root]
+        while stack:
+            frame = stack[-1]
+            _, items, i, new, key = frame
+            while i < len(items):
+                child = items[i]
+                i += 1
+                cls = child.__class__
+                if cls is str:
+                    child = table.setdefault(child, child)
+                    new.append(child)
+                    key.append(id(child))
+                elif cls is tuple or cls is list or isinstance(child, (tuple, list)):
+                    frame[2] = i
+                    stack.append([child, child, 0, [], [_kind(child)]])
+                    break
+                elif isinstance(child, dict):
+                    frame[2] = i
+                    stack.append([child, _children(child), 0, [], ["D"]])
+                    break
+                else:
+                    new.append(child)
+                    key.append(_leaf_key(child))
+            else:
+                stack.pop()
+                if frame is root:
+                    return new[0]
+                key = tuple(key)
+                canonical = table.get(key)
+                if canonical is None:
+                    canonical = table[key] = _build(frame[0], new)
+                parent = stack[-1]
+                parent[3].append(canonical)
+                parent[4].append(id(canonical))
+
+    def hash(self, node):
+        """Return the 64-bit structural hash of node, interning it first."""
+        import hashlib
+
+        node = self.intern(node)
+        hashes = self._hashes
+        stack = [node]
+        while stack:
+            item = stack[-1]
+            if id(item) in hashes or not _is_container(item):
+                stack.pop()
+                continue
+            pending = [
+                child
+                for child in _children(item)
+                if _is_container(child) and id(child) not in hashes
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            digest = hashlib.blake2b(_kind(item).encode(), digest_size=8)
+            for child in _children(item):
+                if _is_container(child):
+                    digest.update(b"@" + hashes[id(child)].to_bytes(8, "big"))
+                else:
+                    digest.update(_encode(child))
+            hashes[id(item)] = int.from_bytes(digest.digest(), "big")
+        if _is_container(node):
+            return hashes[id(node)]
+        digest = hashlib.blake2b(_encode(node), digest_size=8)
+        return int.from_bytes(digest.digest(), "big")
+
+
+def _kind(node):
+    if isinstance(node, tuple):
+        return "T"
+    if isinstance(node, list):
+        return "L"
+    return "D"
+
+
+def _is_container(node):
+    return isinstance(node, (tuple, list, dict))
+
+
+def _children(node):
+    if isinstance(node, dict):
+        return [part for pair in node.items() for part in pair]
+    return node
+
+
+def _leaf_key(item):
+    """Return the part of a structural key standing for item."""
+    # Scalars are keyed by class as well as value: 1, 1.0 and True are equal
+    # in Python but distinct Cypher values.  Floats are keyed by their hex
+    # spelling so 0.0 and -0.0 stay apart.
+    cls = item.__class__
+    if item is None or item is True or item is False:
+        return id(item)
+    if cls is float:
+        return (float, item.hex())
+    return (cls, item)
+
+
+def _build(node, new):
+    """Return the frozen canonical container for node with children new."""
+    if isinstance(node, tuple):
+        return tuple(new)
+    if isinstance(node, list):
+        return FrozenList(new)
+    return FrozenDict(zip(new[0::2], new[1::2]))
+
+
+def _encode(leaf):
+    """Spell a scalar leaf for the structural hash."""
+    if leaf is None:
+        return b"N"
+    if leaf is True:
+        return b"1"
+    if leaf is False:
+        return b"0"
+    if leaf.__class__ is str:
+        data = leaf.encode("utf-8", "surrogatepass")
+        return b"S" + len(data).to_bytes(4, "big") + data
+    if isinstance(leaf, int):
+        return b"I" + str(int(leaf)).encode() + b";"
+    if isinstance(leaf, float):
+        return b"F" + float(leaf).hex().encode() + b";"
+    return b"R" + repr(leaf).encode() + b";"
+
+
+def intern(tree):
+    """Return a frozen copy of tree with equal subtrees shared; see Interner."""
+    return Interner().intern(tree)
+
+
+def structural_hash(node):
+    """Return the 64-bit structural hash of a parse result; see Interner."""
+    return Interner().hash(node)
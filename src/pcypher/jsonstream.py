@@ -0,0 +1,193 @@
+import re
+from json.decoder import scanstring
+from json.encoder import encode_basestring
+from json.scanner import NUMBER_RE
+
+# Pieces of JSON collected before each write to the output stream.
+_BUFFER_PARTS = 1024
+
+
+class _Text:
+    """Punctuation pushed on write_json()'s stack between values."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+_COMMA = _Text(",")
+_CLOSE_ARRAY = _Text("]")
+_CLOSE_OBJECT = _Text("}")
+
+
+def write_json(node, out):
+    """
+    Write a parse result to the text stream out as compact JSON.
+
+    The tree is walked with an explicit stack and written out in chunks, so
+    no JSON string of the whole result is built and deep trees cannot hit
+    the recursion limit.  Tuples and lists become arrays, dicts objects.
+    Raises TypeError for values JSON cannot hold, such as typed_ast nodes.
+    """
+    parts = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        cls = item.__class__
+        if cls is _Text:
+            parts.append(item.text)
+        elif cls is str:
+            parts.append(encode_basestring(item))
+        elif item is None:
+            parts.append("null")
+        elif item is True:
+            parts.append("true")
+        elif item is False:
+            parts.append("false")
+        elif isinstance(item, (tuple, list)):
+            parts.append("[")
+            stack.append(_CLOSE_ARRAY)
+            for i in range(len(item) - 1, 0, -1):
+                stack.append(item[i])
+                stack.append(_COMMA)
+            if item:
+                stack.append(item[0])
+        elif isinstance(item, dict):
+            parts.append("{")
+            stack.append(_CLOSE_OBJECT)
+            first = True
+            for key, value in reversed(list(item.items())):
+                if not isinstance(key, str):
+                    raise TypeError(f"JSON keys must be str, not {type(key).__name__}")
+                if not first:
+                    stack.append(_COMMA)
+                first = False
+                stack.append(value)
+                stack.append(_Text(encode_basestring(key) + ":"))
+        elif isinstance(item, str):
+            parts.append(encode_basestring(item))
+        elif isinstance(item, int):
+            parts.append(int.__repr__(item))
+        elif isinstance(item, float):
+            parts.append(_float(item))
+        else:
+            raise TypeError(f"cannot write {type(item).__name__} as JSON")
+        if len(parts) >= _BUFFER_PARTS:
+            out.write("".join(parts))
+            parts.clear()
+    out.write("".join(parts))
+
+
+def _float(value):
+    """Spell a float the way the json module does."""
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def read_json(text):
+    """
+    Parse JSON text, such as write_json() output, into lists, dicts, str,
+    int, float, bool and None.
+
+    Like write_json() it keeps its own stack, so deeply nested documents
+    cannot hit the recursion limit as json.loads() does.  Raises ValueError
+    for malformed text.
+    """
+    # Open arrays and objects, innermost last, and for each object the key
+    # waiting for its value.
+    containers = []
+    keys = []
+    pos = _skip(text, 0)
+    while True:
+        # Read the value at pos; an opened container continues the loop.
+        char = text[pos : pos + 1]
+        if char == "[":
+            pos = _skip(text, pos + 1)
+            if not text.startswith("]", pos):
+                containers.append([])
+                keys.append(None)
+                continue
+            value = []
+            pos += 1
+        elif char == "{":
+            pos = _skip(text, pos + 1)
+            if not text.startswith("}", pos):
+                key, pos = _key(text, pos)
+                containers.append({})
+                keys.append(key)
+                continue
+            value = {}
+            pos += 1
+        elif char == '"':
+            value, pos = scanstring(text, pos + 1)
+        else:
+            match = NUMBER_RE.match(text, pos)
+            if match is not None:
+                integer, frac, exp = match.groups()
+                value = float(match.group()) if frac or exp else int(integer)
+                pos = match.end()
+            else:
+                for word, value in _CONSTANTS:
+                    if text.startswith(word, pos):
+                        pos += len(word)
+                        break
+                else:
+                    raise ValueError(f"expected a JSON value at offset {pos}")
+        # Store the value, then every container it completes.
+        while True:
+            pos = _skip(text, pos)
+            if not containers:
+                if pos != len(text):
+                    raise ValueError(f"extra data at offset {pos}")
+                return value
+            top = containers[-1]
+            if top.__class__ is list:
+                top.append(value)
+                close = "]"
+            else:
+                top[keys[-1]] = value
+                close = "}"
+            char = text[pos : pos + 1]
+            if char == ",":
+                pos = _skip(text, pos + 1)
+                if close == "}":
+                    keys[-1], pos = _key(text, pos)
+                break
+            if char != close:
+                raise ValueError(f"expected ',' or {close!r} at offset {pos}")
+            pos += 1
+            value = containers.pop()
+            keys.pop()
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_CONSTANTS = (
+    ("null", None),
+    ("true", True),
+    ("false", False),
+    ("NaN", float("nan")),
+    ("Infinity", float("inf")),
+    ("-Infinity", -float("inf")),
+)
+
+
+def _skip(text, pos):
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _key(text, pos):
+    """Read an object key and its colon at pos; return (key, next offset)."""
+    if not text.startswith('"', pos):
+        raise ValueError(f"expected a JSON object key at offset {pos}")
+    key, pos = scanstring(text, pos + 1)
+    pos = _skip(text, pos)
+    if not text.startswith(":", pos):
+        raise ValueError(f"expected ':' at offset {pos}")
+    return key, _skip(text, pos + 1)
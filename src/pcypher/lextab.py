@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ADD', 'ALL', 'AND', 'ARROW', 'AS', 'ASC', 'ASCENDING', 'BY', 'CALL', 'CARET', 'CASE', 'COLON', 'COMMA', 'CONSTRAINT', 'CONTAINS', 'CREATE', 'CYPHER', 'DASH', 'DELETE', 'DESC', 'DESCENDING', 'DETACH', 'DISTINCT', 'DO', 'DOT', 'DROP', 'ELSE', 'END', 'ENDS', 'ENDS_WITH', 'EQ', 'EXISTS', 'FALSE', 'FOR', 'GE', 'GT', 'IDENTIFIER', 'IN', 'IS', 'IS_NOT_NULL', 'IS_NULL', 'LBRACE', 'LBRACKET', 'LE', 'LIMIT', 'LPAREN', 'LT', 'MANDATORY', 'MATCH', 'MERGE', 'MINUS', 'NOT', 'NULL', 'NUMBER', 'OF', 'ON', 'OPTIONAL', 'OR', 'ORDER', 'PARAM', 'PERCENT', 'PIPE', 'PLUS', 'PLUS_EQ', 'RBRACE', 'RBRACKET', 'REMOVE', 'REQUIRE', 'RETURN', 'RPAREN', 'SCALAR', 'SET', 'SKIP', 'SLASH', 'STAR', 'STARTS', 'STARTS_WITH', 'STRING', 'THEN', 'TRUE', 'UNION', 'UNIQUE', 'UNWIND', 'WHEN', 'WHERE', 'WITH', 'XOR', 'YIELD'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_ENDS_WITH>ENDS\\s+WITH)|(?P<t_STARTS_WITH>STARTS\\s+WITH)|(?P<t_IS_NOT_NULL>IS\\s+NOT\\s+NULL)|(?P<t_IS_NULL>IS\\s+NULL)|(?P<t_NUMBER>\\d+(\\.\\d+)?)|(?P<t_STRING>(\'([^\\\\\\n]|(\\\\.))*?\')|("([^\\\\\\n]|(\\\\.))*?"))|(?P<t_BACKTICK_IDENTIFIER>`([^`\\\\]|(\\\\.))*`)|(?P<t_IDENTIFIER>[A-Za-z_][A-Za-z_0-9]*)|(?P<t_PARAM>\\$[A-Za-z_][A-Za-z_0-9]*)|(?P<t_COMMENT>//.*)|(?P<t_BLOCK_COMMENT>/\\*(.|\\n)*?\\*/)|(?P<t_newline>\\n+)|(?P<t_PLUS_EQ>\\+=)|(?P<t_ARROW>->)|(?P<t_CARET>\\^)|(?P<t_DOT>\\.)|(?P<t_GE>>=)|(?P<t_LBRACE>\\{)|(?P<t_LBRACKET>\\[)|(?P<t_LE><=)|(?P<t_LPAREN>\\()|(?P<t_PIPE>\\|)|(?P<t_PLUS>\\+)|(?P<t_RBRACE>\\})|(?P<t_RBRACKET>\\])|(?P<t_RPAREN>\\))|(?P<t_STAR>\\*)|(?P<t_COLON>:)|(?P<t_COMMA>,)|(?P<t_DASH>-)|(?P<t_EQ>=)|(?P<t_GT>>)|(?P<t_LT><)|(?P<t_PERCENT>%)|(?P<t_SLASH>/)', [None, ('t_ENDS_WITH', 'ENDS_WITH'), ('t_STARTS_WITH', 'STARTS_WITH'), ('t_IS_NOT_NULL', 'IS_NOT_NULL'), ('t_IS_NULL', 'IS_NULL'), ('t_NUMBER', 'NUMBER'), None, ('t_STRING', 'STRING'), None, None, None, None, None, None, ('t_BACKTICK_IDENTIFIER', 'BACKTICK_IDENTIFIER'), None, None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_PARAM', 'PARAM'), ('t_COMMENT', 'COMMENT'), ('t_BLOCK_COMMENT', 'BLOCK_COMMENT'), None, ('t_newline', 'newline'), (None, 'PLUS_EQ'), (None, 'ARROW'), (None, 'CARET'), (None, 'DOT'), (None, 'GE'), (None, 'LBRACE'), (None, 'LBRACKET'), (None, 'LE'), (None, 'LPAREN'), (None, 'PIPE'), (None, 'PLUS'), (None, 'RBRACE'), (None, 'RBRACKET'), (None, 'RPAREN'), (None, 'STAR'), (None, 'COLON'), (None, 'COMMA'), (None, 'DASH'), (None, 'EQ'), (None, 'GT'), (None, 'LT'), (None, 'PERCENT'), (None, 'SLASH')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -1,15 +1,106 @@
-from pcypher import CypherParser, CypherLexer
+from pcypher import get_parser
+from pcypher.daemon import Client, serve
+from pcypher.jsonstream import write_json
+from pcypher.statements import split_statements
 import argparse
+import sys
+
+
+def results(queries, args):
+    """
+    Yield ``(result, messages)`` per query, parsed locally or by the daemon.
+
+    With the repr format the local parser prints its own errors, as it
+    always has, and messages is empty; the daemon sends the same lines as
+    messages instead.
+    """
+    if args.connect:
+        format = "repr" if args.format == "repr" else "json"
+        with Client(args.connect) as client:
+            for query in queries:
+                response = client.parse(query, format)
+                yield response["result"], response["errors"]
+    else:
+        parser = get_parser()
+        for query in queries:
+            if args.format == "repr":
+                yield parser.parse(query), []
+            else:
+                result, errors = parser.parse_with_errors(query)
+                yield result, [str(err) for err in errors]
+
+
+def output(queries, args):
+    """Write the result of each query to stdout in the selected format."""
+    out = sys.stdout
+    if args.format == "repr":
+        for result, messages in results(queries, args):
+            for message in messages:
+                print(message)
+            print(f"{str(result)}")
+        return
+    # JSON output stays machine-readable: error messages go to stderr.
+    if args.format == "json":
+        out.write("[")
+    for i, (result, messages) in enumerate(results(queries, args)):
+        for message in messages:
+            print(message, file=sys.stderr)
+        if args.format == "json" and i:
+            out.write(",")
+        write_json(result, out)
+        if args.format == "ndjson":
+            out.write("\n")
+    if args.format == "json":
+        out.write("]\n")
 
 
 def main():
-    args = argparse.ArgumentParser()
-    args.add_argument("query", help="Query to parse")
-    args = args.parse_args()
+    if sys.argv[1:2] == ["serve"]:
+        args = argparse.ArgumentParser(
+            prog="pcypher serve",
+            description="Keep a warm parser and answer --connect clients.",
+        )
+        args.add_argument(
+            "--socket", required=True, metavar="PATH", help="Unix socket to listen on"
+        )
+        args = args.parse_args(sys.argv[2:])
+        serve(args.socket)
+        return
+
+    cli = argparse.ArgumentParser(
+        epilog="Run 'pcypher serve --socket PATH' to start a daemon for --connect."
+    )
+    cli.add_argument(
+        "query",
+        nargs="?",
+        help="Query to parse, or - to read ;-separated queries from stdin",
+    )
+    cli.add_argument(
+        "--input", metavar="FILE", help="Read ;-separated queries from FILE"
+    )
+    cli.add_argument(
+        "--format",
+        choices=("repr", "json", "ndjson"),
+        default="repr",
+        help="Print Python reprs (default), one JSON array of all results, "
+        "or one JSON result per line",
+    )
+    cli.add_argument(
+        "--connect",
+        metavar="PATH",
+        help="Send the queries to the pcypher daemon listening on PATH",
+    )
+    args = cli.parse_args()
+    if (args.query is None) == (args.input is None):
+        cli.error("give either a query or --input FILE")
 
-    parser = CypherParser()
-    result = parser.parse(args.query)
-    print(f"{str(result)}")
+    if args.input is not None:
+        with open(args.input, encoding="utf-8") as stream:
+            output(split_statements(stream), args)
+    elif args.query == "-":
+        output(split_statements(sys.stdin), args)
+    else:
+        output([args.query], args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,334 @@
+import operator
+
+
+class Node:
+    """
+    Base class of the typed AST.
+
+    Every tagged tuple produced by CypherParser, such as
+    ``("binop", op, left, right)``, has a class with one slot per element
+    after the tag, e.g. ``BinOp(op, left, right)``.  Nodes are immutable and
+    as_tuple() returns the tuple form the parser would have produced.
+    Untagged pairs (property entries, chain steps, CASE branches) and lists
+    stay tuples and lists.
+    """
+
+    __slots__ = ()
+    tag = None
+    fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.children = _getter(cls.fields)
+
+    def __init__(self, *values):
+        if len(values) != len(self.fields):
+            raise TypeError(
+                f"{type(self).__name__} takes {len(self.fields)} values, "
+                f"got {len(values)}"
+            )
+        for name, value in zip(self.fields, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.children() == other.children()
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{f}={v!r}" for f, v in zip(self.fields, self.children()))
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        return type(self), self.children()
+
+    def children(self):
+        """Return the field values as a tuple, in order."""
+        return ()
+
+    def as_tuple(self):
+        """Return the tuple form of this subtree."""
+        return to_tuples(self)
+
+
+def _getter(fields):
+    """Build a fast children() method for a class with the given fields."""
+    if not fields:
+        return Node.children
+    get = operator.attrgetter(*fields)
+    if len(fields) > 1:
+        return lambda self: get(self)
+    return lambda self: (get(self),)
+
+
+class RelationshipType(Node):
+    """``{"variable": ..., "type": ...}`` entry of a relationship pattern."""
+
+    __slots__ = fields = ("variable", "type")
+
+    def as_tuple(self):
+        return {"variable": self.variable, "type": self.type}
+
+
+class Range(Node):
+    """``{"min": ..., "max": ...}`` length of a variable-length relationship."""
+
+    __slots__ = fields = ("min", "max")
+
+    def as_tuple(self):
+        return {"min": self.min, "max": self.max}
+
+
+# Tag -> (class name, fields).  A field written "name:pairs" holds a list of
+# untagged 2-tuples whose items are converted one by one; a plain tuple in
+# any other position is always tagged.
+_SPECS = {
+    "UNION": ("Union", "left right"),
+    "UNION_ALL": ("UnionAll", "left right"),
+    "version": ("Version", "number"),
+    "MATCH": ("MatchClause", "pattern where"),
+    "OPTIONAL_MATCH": ("OptionalMatchClause", "pattern where"),
+    "MANDATORY_MATCH": ("MandatoryMatchClause", "pattern where"),
+    "CREATE": ("CreateClause", "pattern"),
+    "MERGE": ("MergeClause", "pattern"),
+    "RETURN": ("ReturnClause", "items"),
+    "RETURN_DISTINCT": ("ReturnDistinctClause", "items"),
+    "WITH": ("WithClause", "items"),
+    "SET": ("SetClause", "items"),
+    "DELETE": ("DeleteClause", "items"),
+    "DETACH_DELETE": ("DetachDeleteClause", "items"),
+    "REMOVE": ("RemoveClause", "items"),
+    "CALL": ("CallClause", "procedure yield_clause where"),
+    "YIELD": ("YieldClause", "items"),
+    "UNWIND": ("UnwindClause", "expression variable"),
+    "ORDER": ("OrderClause", "items"),
+    "SKIP": ("SkipClause", "expression"),
+    "LIMIT": ("LimitClause", "expression"),
+    "alias": ("Alias", "expression name"),
+    "wildcard": ("Wildcard", ""),
+    "order_item": ("OrderItem", "expression direction"),
+    "pattern_alias": ("PatternAlias", "variable pattern"),
+    "chain": ("Chain", "start steps:pairs"),
+    "node": ("NodePattern", "variable labels properties:pairs"),
+    "node_param": ("NodeParam", "name"),
+    "directed": ("Directed", "relationship"),
+    "undirected": ("Undirected", "relationship"),
+    "directed_inbound": ("DirectedInbound", "relationship"),
+    "relationship": ("Relationship", "types length properties:pairs"),
+    "property_access": ("PropertyAccess", "variable key"),
+    "set": ("SetProperty", "target value"),
+    "set_node": ("SetNode", "variable value"),
+    "set_merge": ("SetMerge", "variable value"),
+    "set_merge_property": ("SetMergeProperty", "target value"),
+    "set_label": ("SetLabel", "variable label"),
+    "set_labels": ("SetLabels", "variable labels"),
+    "remove_property": ("RemoveProperty", "target"),
+    "remove_labels": ("RemoveLabels", "variable labels"),
+    "proc_call": ("ProcedureCall", "name arguments"),
+    "binop": ("BinOp", "op left right"),
+    "logical": ("Logical", "op left right"),
+    "contains": ("Contains", "left right"),
+    "ends_with": ("EndsWith", "left right"),
+    "starts_with": ("StartsWith", "left right"),
+    "in": ("In", "left right"),
+    "is_null": ("IsNull", "expression"),
+    "is_not_null": ("IsNotNull", "expression"),
+    "not": ("Not", "expression"),
+    "uminus": ("UnaryMinus", "expression"),
+    "distinct": ("Distinct", "expression"),
+    "property": ("Property", "expression key"),
+    "index": ("Index", "expression index"),
+    "slice": ("Slice", "expression start end"),
+    "list": ("ListLiteral", "items"),
+    "map": ("MapLiteral", "items:pairs"),
+    "map_projection": ("MapProjection", "variable items"),
+    "projection_shorthand": ("ProjectionShorthand", "key"),
+    "projection_alias": ("ProjectionAlias", "key expression"),
+    "projection_wildcard": ("ProjectionWildcard", ""),
+    "list_comprehension": ("ListComprehension", "variable source where projection"),
+    "pattern_expr": ("PatternExpression", "pattern"),
+    "pattern_comprehension": ("PatternComprehension", "pattern where projection"),
+    "label_check": ("LabelCheck", "variable label"),
+    "case": ("Case", "operand branches:pairs default"),
+    "func_call": ("FunctionCall", "name arguments"),
+    "param": ("Param", "name"),
+    "star": ("Star", ""),
+}
+
+# Tag -> node class, and node class -> indexes of its pair-list fields.
+CLASSES = {}
+_PAIR_FIELDS = {}
+
+
+def _make_class(tag, name, spec):
+    fields = tuple(f.split(":")[0] for f in spec.split())
+    form = ", ".join((repr(tag),) + fields) if fields else f"{tag!r},"
+    cls = type(
+        name,
+        (Node,),
+        {
+            "__slots__": fields,
+            "__doc__": f"``({form})`` node.",
+            "__module__": __name__,
+            "tag": tag,
+            "fields": fields,
+        },
+    )
+    _PAIR_FIELDS[cls] = frozenset(
+        i for i, f in enumerate(spec.split()) if f.endswith(":pairs")
+    )
+    return cls
+
+
+for _tag, (_name, _spec) in _SPECS.items():
+    CLASSES[_tag] = globals()[_name] = _make_class(_tag, _name, _spec)
+
+
+class WithWhereClause(CLASSES["WITH"]):
+    """``("WITH", items, where)`` node, the form with a WHERE part."""
+
+    __slots__ = ("where",)
+    fields = ("items", "where")
+
+
+_PAIR_FIELDS[WithWhereClause] = frozenset()
+
+
+# How _node_frame() converts a value: as any part of a result, as a field
+# holding a list of untagged pairs, or as one such pair.
+_VALUE, _PAIRS, _PAIR = range(3)
+
+# Node class -> the conversion mode of each of its fields.
+_FIELD_MODES = {
+    cls: tuple(_PAIRS if i in pairs else _VALUE for i in range(len(cls.fields)))
+    for cls, pairs in _PAIR_FIELDS.items()
+}
+
+
+def to_tuples(value):
+    """Convert a parse result made of Node objects back into tuple form."""
+    # Frames: [tag or container class, children, next child, converted].
+    # The explicit stack keeps deep results off the recursion limit.
+    frame = _tuple_frame(value)
+    if frame is None:
+        return _tuple_leaf(value)
+    stack = [frame]
+    while True:
+        frame = stack[-1]
+        _, children, i, done = frame
+        while i < len(children):
+            child = children[i]
+            i += 1
+            if child.__class__ is str or child is None:
+                done.append(child)
+                continue
+            inner = _tuple_frame(child)
+            if inner is None:
+                done.append(_tuple_leaf(child))
+            else:
+                frame[2] = i
+                stack.append(inner)
+                break
+        else:
+            stack.pop()
+            kind = frame[0]
+            if kind is list:
+                value = done
+            elif kind is tuple:
+                value = tuple(done)
+            else:
+                value = (kind, *done)
+            if not stack:
+                return value
+            stack[-1][3].append(value)
+
+
+def _tuple_frame(value):
+    """Return a to_tuples() frame for value, or None if it is a leaf."""
+    if isinstance(value, Node):
+        if type(value).as_tuple is not Node.as_tuple:
+            return None  # RelationshipType and Range become dicts.
+        return [value.tag, value.children(), 0, []]
+    if isinstance(value, list):
+        return [list, value, 0, []]
+    if isinstance(value, tuple):
+        return [tuple, value, 0, []]
+    return None
+
+
+def _tuple_leaf(value):
+    return value.as_tuple() if isinstance(value, Node) else value
+
+
+def to_nodes(ast):
+    """Convert a tuple-form parse result into Node objects."""
+    # Frames: [node class or container class, items, conversion mode of
+    # every item (or one per item), next item, converted items].
+    frame = _node_frame(ast, _VALUE)
+    if frame is None:
+        return _node_leaf(ast)
+    stack = [frame]
+    while True:
+        frame = stack[-1]
+        _, items, modes, i, done = frame
+        while i < len(items):
+            item = items[i]
+            i += 1
+            if item.__class__ is str or item is None:
+                done.append(item)
+                continue
+            mode = modes if modes.__class__ is int else modes[i - 1]
+            inner = _node_frame(item, mode)
+            if inner is None:
+                done.append(_node_leaf(item))
+            else:
+                frame[3] = i
+                stack.append(inner)
+                break
+        else:
+            stack.pop()
+            kind = frame[0]
+            if kind is list:
+                value = done
+            elif kind is tuple:
+                value = tuple(done)
+            else:
+                value = kind(*done)
+            if not stack:
+                return value
+            stack[-1][4].append(value)
+
+
+def _node_frame(value, mode):
+    """Return a to_nodes() frame for value, or None if it is a leaf."""
+    if mode == _PAIRS:
+        if isinstance(value, list):
+            return [list, value, _PAIR, 0, []]
+    elif mode == _PAIR:
+        return [tuple, value, _VALUE, 0, []]
+    if isinstance(value, list):
+        return [list, value, _VALUE, 0, []]
+    if isinstance(value, tuple):
+        cls = CLASSES.get(value[0]) if value and isinstance(value[0], str) else None
+        if cls is None:
+            return [tuple, value, _VALUE, 0, []]
+        if len(value) == 3 and value[0] == "WITH":
+            cls = WithWhereClause
+        return [cls, value[1:], _FIELD_MODES[cls], 0, []]
+    return None
+
+
+def _node_leaf(value):
+    if isinstance(value, dict):
+        if "type" in value:
+            return RelationshipType(value["variable"], value["type"])
+        return Range(value["min"], value["max"])
+    return value
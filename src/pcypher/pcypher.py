@@ -1,9 +1,45 @@
-import ply.lex as lex
-import ply.yacc as yacc
+import copy
+import functools
+import threading
 
-import warnings
+from .cache import MISSING, ParseCache, QueryTemplate, Slot, freeze
+from .errors import CypherSyntaxError
+from .fold import fold
+from .intern import Interner
+from .nodes import to_nodes
+from .tokens import TokenStream
 
-warnings.filterwarnings("ignore")
+# PLY and multiprocessing are imported where they are first needed, so that
+# importing this module (say, for RESERVED) stays cheap.
+
+# Ways CypherParser reports syntax errors; see CypherParser.__init__().
+# Internally on_error may also be a callable: "print" mode handing each
+# line to it instead of writing to stdout (see pcypher.daemon).
+ON_ERROR = ("print", "collect", "raise")
+
+# Lexer backends CypherParser can run on; see CypherParser.__init__().
+LEXERS = ("ply", "fast")
+
+# Cached in place of a QueryTemplate for shapes that cannot be shared.
+_UNSHAREABLE = object()
+
+
+class _Abandon(Exception):
+    """Raised by a grammar action to give up on a query that cannot recover."""
+
+
+def _summary(p):
+    """Return the QuerySummary the grammar actions of p's parse fill, or None."""
+    state = getattr(p.lexer, "parse_state", None)
+    return None if state is None else state.summary
+
+
+# Frozen lexer and LALR tables shipped inside the package.  The optimized
+# mode loads them as-is: no signature check, no regeneration, no file writes.
+# After changing token rules, delete lextab.py and build once with
+# ``CypherLexer().build(optimize=True)`` to regenerate it.
+LEXTAB = f"{__package__}.lextab"
+PARSETAB = f"{__package__}.parsetab"
 
 # Reserved keywords for Cypher queries.
 RESERVED = {
@@ -199,12 +235,25 @@ class CypherLexer:
         t.lexer.lineno += len(t.value)
 
     def t_error(self, t):
-        print(f"Illegal character '{t.value[0]}'")
+        message = f"Illegal character '{t.value[0]}'"
+        state = getattr(t.lexer, "parse_state", None)
+        if state is None:
+            print(message)
+        else:
+            state.error(message, t.lexpos, t.value[0])
         t.lexer.skip(1)
 
-    def build(self, **kwargs):
-        """Build the lexer."""
-        self.lexer = lex.lex(module=self, **kwargs)
+    def build(self, optimize=False, **kwargs):
+        """Build the lexer.
+
+        With ``optimize`` the master regex is read from the frozen lextab
+        module instead of validating every rule and recompiling it.
+        """
+        import ply.lex as lex
+
+        if optimize:
+            kwargs.setdefault("lextab", LEXTAB)
+        self.lexer = lex.lex(module=self, optimize=optimize, **kwargs)
 
     def input(self, data):
         """Input data for lexing."""
@@ -214,6 +263,134 @@ class CypherLexer:
         """Return the next token."""
         return self.lexer.token()
 
+    def tokenize(self, data):
+        """
+        Lex data into a TokenStream: type ids and token offsets in compact
+        arrays, with values derived lazily.  Illegal characters are recorded
+        in its ``errors`` instead of being printed.
+
+        Pass the stream to CypherParser.parse() to parse it without lexing
+        again.  Safe to call from several threads; each call lexes on its own
+        clone of the built lexer.
+        """
+        stream = TokenStream(data, self.tokens)
+        lexer = self.lexer.clone()
+        lexer.parse_state = stream
+        lexer.lineno = 1
+        lexer.input(data)
+        ids = _TOKEN_IDS
+        types, starts, ends = stream.types, stream.starts, stream.ends
+        for tok in iter(lexer.token, None):
+            types.append(ids[tok.type])
+            starts.append(tok.lexpos)
+            ends.append(lexer.lexpos)
+        return stream
+
+
+# Type id of each token type in a TokenStream.
+_TOKEN_IDS = {name: i for i, name in enumerate(CypherLexer.tokens)}
+
+
+class _SharedTables:
+    """
+    Lexer and LALR tables loaded once per process.
+
+    The master regex and the action/goto tables never change after loading,
+    so every optimized CypherParser shares them and only owns a cloned lexer
+    and an LRParser whose productions are bound to its own grammar actions.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        import ply.yacc as yacc
+
+        lexer = CypherLexer()
+        lexer.build(optimize=True)
+        self.lexer = lexer.lexer
+        self.lrtab = yacc.LRTable()
+        self.lrtab.read_table(PARSETAB)
+
+    @classmethod
+    def get(cls):
+        """Return the shared tables, loading them on first use."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def bind(self, parser):
+        """Return an LRParser driving the shared tables with parser's actions."""
+        import ply.yacc as yacc
+
+        lrtab = copy.copy(self.lrtab)
+        lrtab.lr_productions = [copy.copy(prod) for prod in lrtab.lr_productions]
+        lrtab.bind_callables(
+            {
+                prod.func: getattr(parser, prod.func)
+                for prod in lrtab.lr_productions
+                if prod.func
+            }
+        )
+        return yacc.LRParser(lrtab, parser.p_error)
+
+
+class _ParseState:
+    """
+    A lexer/LRParser pair borrowed by one parse, and that parse's errors.
+
+    The lexer points back to it as ``lexer.parse_state``, so lexer rules and
+    grammar actions reach it through ``t.lexer`` and ``p.lexer``.
+    """
+
+    def __init__(self, lexer, parser):
+        self.lexer = lexer
+        self.parser = parser
+        self.data = None
+        self.errors = None
+        self.on_error = "print"
+        # Writes the lines of "print" mode; None in the other modes.
+        self.echo = print
+        self.recovered_at = None
+        # QuerySummary filled in by the grammar actions, if one was asked for.
+        self.summary = None
+        lexer.parse_state = self
+        parser.errorfunc = self.syntax_error
+
+    def begin(self, data, on_error, summary=None):
+        """Prepare for parsing data."""
+        self.data = data
+        self.errors = None
+        if callable(on_error):
+            self.on_error, self.echo = "print", on_error
+        else:
+            self.on_error = on_error
+            self.echo = print if on_error == "print" else None
+        self.recovered_at = None
+        self.summary = summary
+        self.lexer.lineno = 1
+
+    def error(self, message, lexpos, token=None, expected=None):
+        """Record a syntax error, printing or raising it as on_error asks."""
+        if self.echo is not None:
+            self.echo(message)
+        err = CypherSyntaxError.at(message, self.data, lexpos, token, expected)
+        if self.on_error == "raise":
+            raise err
+        if self.errors is None:
+            self.errors = []
+        self.errors.append(err)
+
+    def syntax_error(self, tok):
+        """Error function of the LRParser; replaces CypherParser.p_error."""
+        expected = sorted(self.parser.action[self.parser.state])
+        if tok is None:
+            self.error("Syntax error at EOF", len(self.data or ""), None, expected)
+        else:
+            self.error(f"Syntax error at '{tok.value}'", tok.lexpos, tok.value, expected)
+
 
 class CypherParser:
     """
@@ -234,12 +411,131 @@ class CypherParser:
         ("right", "UMINUS"),
     )
 
-    def __init__(self):
+    # Token types replaced by Slot placeholders in fingerprint mode.
+    literal_tokens = ("NUMBER", "STRING")
+
+    def __init__(
+        self,
+        optimize=False,
+        cache_size=None,
+        cache_bytes=None,
+        fingerprint=False,
+        on_error="print",
+        typed_ast=False,
+        lexer="ply",
+        fold_constants=False,
+        intern=False,
+        profile=None,
+        spans=False,
+    ):
+        """
+        Build the lexer and the LALR parser.
+
+        With ``optimize`` the packaged lextab/parsetab modules are loaded
+        directly: grammar signatures are not checked and nothing is written
+        to disk, which keeps cold starts short and works on read-only
+        installs.  The loaded tables are shared by every optimized instance
+        in the process.
+
+        Setting ``cache_size`` (entries) and/or ``cache_bytes`` puts an LRU
+        cache keyed on the query text in front of parse().  Results are then
+        frozen: lists and dicts in the AST reject mutation, so a caller cannot
+        corrupt what other callers get back.
+
+        With ``fingerprint`` the cache is keyed on the token stream with
+        NUMBER and STRING literals masked, so queries that only differ in
+        literal values share one entry; see parse_template().
+
+        ``on_error`` selects how syntax errors surface from parse():
+        "print" writes them to stdout and returns whatever error recovery
+        produced (possibly None), "collect" prints nothing and returns the
+        first CypherSyntaxError in place of the result, and "raise" raises
+        it.  parse_with_errors() returns all of them.
+
+        With ``typed_ast`` results are trees of the immutable Node classes in
+        pcypher.nodes instead of tagged tuples; ``node.as_tuple()`` gives the
+        tuple form back.  Caches still hold tuples, and each call gets its
+        own nodes.
+
+        ``lexer="fast"`` tokenizes with pcypher.fastlex.FastLexer, a single
+        regex scanner producing the same tokens as the PLY lexer built from
+        CypherLexer's rules ("ply", the default) at a lower cost per token.
+
+        With ``fold_constants`` every result goes through pcypher.fold.fold()
+        before it is cached or returned: constant arithmetic, logic and pure
+        function calls become their values and double negations disappear.
+
+        With ``intern`` results are frozen as with a cache and hash-consed by
+        pcypher.intern.Interner: structurally equal subtrees of a result,
+        such as repeated node references, are one shared object.
+
+        ``profile`` is a callback called after every parse with a
+        pcypher.profile.ParseProfile: seconds spent lexing, in the LALR
+        driver, in grammar actions and in post-parse passes, the token count
+        and per-action reduction counts and times.  pcypher.profile.Profiler
+        sums them up.  Without it parses take the uninstrumented paths.
+        Worker processes of parse_many() are not profiled.
+
+        With ``spans`` parse_with_spans() is available: it also returns the
+        source offsets of every node, in a side table.  Other parses return
+        the same results either way, at a small cost per grammar action
+        with ``spans``.
+        """
+        if on_error not in ON_ERROR:
+            raise ValueError(f"on_error must be one of {ON_ERROR}, not {on_error!r}")
+        if lexer not in LEXERS:
+            raise ValueError(f"lexer must be one of {LEXERS}, not {lexer!r}")
+        self.on_error = on_error
         self.lexer = CypherLexer()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self)
+        if lexer == "fast":
+            from .fastlex import FastLexer
+
+            self.lexer.lexer = FastLexer()
+        elif optimize:
+            self.lexer.lexer = _SharedTables.get().lexer.clone(self.lexer)
+        else:
+            self.lexer.build()
+        if optimize:
+            self.parser = _SharedTables.get().bind(self)
+        else:
+            import ply.yacc as yacc
+
+            self.parser = yacc.yacc(module=self)
+        # Idle _ParseState objects borrowed by parse(); see _acquire().
+        self._pool = []
+        self._cache = None
+        if cache_size is not None or cache_bytes is not None:
+            self._cache = ParseCache(cache_size, cache_bytes)
+        self._fingerprint = fingerprint
+        self._typed_ast = typed_ast
+        self._fold_constants = fold_constants
+        self._intern = intern
+        # Constructor options, replayed by parse_many() worker processes.
+        self._options = {
+            "cache_size": cache_size,
+            "cache_bytes": cache_bytes,
+            "fingerprint": fingerprint,
+            "on_error": on_error,
+            "typed_ast": typed_ast,
+            "lexer": lexer,
+            "fold_constants": fold_constants,
+            "intern": intern,
+        }
+        # Thread-local read by the span-recording grammar actions.
+        self._spans = None
+        if spans:
+            from .spans import instrument
+
+            self._spans = instrument(self)
+        if profile is not None:
+            from .profile import instrument
+
+            instrument(self, profile)
 
     # Grammar Rules
+    #
+    # Left-recursive list rules append to the list built for p[1] rather than
+    # copying it, so long lists are accumulated in linear time.
 
     def p_query(self, p):
         """query : version_header query_part
@@ -287,7 +583,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
 
     def p_match_clause(self, p):
         """match_clause : MATCH pattern_spec where_clause_opt"""
@@ -315,7 +612,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_return_item(self, p):
         """return_item : expression"""
@@ -344,7 +642,8 @@ class CypherParser:
         if len(p) == 1:
             p[0] = []
         else:
-            p[0] = p[1] + [(p[2], p[3])]
+            p[1].append((p[2], p[3]))
+            p[0] = p[1]
 
     def p_pattern_list(self, p):
         """pattern_list : pattern
@@ -352,7 +651,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_node_pattern(self, p):
         "node_pattern : LPAREN node_content_opt RPAREN"
@@ -379,19 +679,31 @@ class CypherParser:
     def p_node_content_param(self, p):
         "node_content : PARAM"
         p[0] = ("node_param", p[1])
+        summary = _summary(p)
+        if summary is not None:
+            summary.params[p[1]] += 1
 
     def p_node_content_with_param(self, p):
         "node_content : IDENTIFIER labels_opt PARAM"
         p[0] = ("node", p[1], p[2], ("param", p[3]))
+        summary = _summary(p)
+        if summary is not None:
+            summary.params[p[3]] += 1
 
     def p_node_content_anonymous(self, p):
         "node_content : COLON IDENTIFIER labels_opt property_map_opt"
         # p[2] is the first label, p[3] contains any additional labels.
         p[0] = ("node", None, [p[2]] + p[3], p[4])
+        summary = _summary(p)
+        if summary is not None:
+            summary.labels[p[2]] += 1
 
     def p_property_access(self, p):
         "property_access : IDENTIFIER DOT IDENTIFIER"
         p[0] = ("property_access", p[1], p[3])
+        summary = _summary(p)
+        if summary is not None:
+            summary.property_keys[p[3]] += 1
 
     def p_labels_opt(self, p):
         """labels_opt :
@@ -399,7 +711,11 @@ class CypherParser:
         if len(p) == 1:
             p[0] = []
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
+            summary = _summary(p)
+            if summary is not None:
+                summary.labels[p[3]] += 1
 
     def p_property_map_opt(self, p):
         """property_map_opt :
@@ -424,7 +740,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_pattern_spec(self, p):
         """pattern_spec : pattern_alias
@@ -438,6 +755,9 @@ class CypherParser:
     def p_property(self, p):
         "property : IDENTIFIER COLON expression"
         p[0] = (p[1], p[3])
+        summary = _summary(p)
+        if summary is not None:
+            summary.property_keys[p[1]] += 1
 
     def p_relationship_pattern(self, p):
         """relationship_pattern : DASH LBRACKET relationship_content RBRACKET ARROW
@@ -461,7 +781,8 @@ class CypherParser:
 
     def p_relationship_type_list_multiple(self, p):
         "relationship_type_list : relationship_type_list PIPE relationship_base"
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
     def p_relationship_base(self, p):
         """relationship_base : IDENTIFIER COLON reltype
@@ -476,6 +797,10 @@ class CypherParser:
             p[0] = {"variable": p[1], "type": None}
         else:
             p[0] = {"variable": None, "type": None}
+        if p[0]["type"] is not None:
+            summary = _summary(p)
+            if summary is not None:
+                summary.relationship_types[p[0]["type"]] += 1
 
     def p_relationship_length_opt(self, p):
         """relationship_length_opt : STAR
@@ -534,7 +859,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_expression_logical(self, p):
         """expression : expression AND expression
@@ -565,6 +891,9 @@ class CypherParser:
     def p_expression_property(self, p):
         "expression : expression DOT IDENTIFIER"
         p[0] = ("property", p[1], p[3])
+        summary = _summary(p)
+        if summary is not None:
+            summary.property_keys[p[3]] += 1
 
     def p_expression_uminus(self, p):
         "expression : DASH expression %prec UMINUS"
@@ -601,6 +930,9 @@ class CypherParser:
     def p_expression_param(self, p):
         "expression : PARAM"
         p[0] = ("param", p[1])
+        summary = _summary(p)
+        if summary is not None:
+            summary.params[p[1]] += 1
 
     def p_function_call(self, p):
         "function_call : IDENTIFIER LPAREN arg_list RPAREN"
@@ -617,11 +949,25 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_expression_error(self, p):
         "expression : error"
-        print("Syntax error in expression!")
+        # The error itself has been reported already; this only notes the
+        # recovery, so it stays quiet unless errors are printed.
+        state = getattr(p.lexer, "parse_state", None)
+        if state is None:
+            print("Syntax error in expression!")
+        elif state.echo is not None:
+            state.echo("Syntax error in expression!")
+        if state is not None:
+            # Recovering twice in front of the same token means the parser
+            # will keep recovering there forever, e.g. on "WHERE n.x = )".
+            lexpos = getattr(p.slice[1], "lexpos", None)
+            if lexpos is not None and lexpos == state.recovered_at:
+                raise _Abandon()
+            state.recovered_at = lexpos
         p[0] = None
 
     def p_error(self, p):
@@ -644,7 +990,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_with_item(self, p):
         """with_item : expression
@@ -661,7 +1008,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_set_item(self, p):
         "set_item : property_access EQ expression"
@@ -718,6 +1066,9 @@ class CypherParser:
     def p_expression_label_check(self, p):
         "expression : IDENTIFIER COLON IDENTIFIER"
         p[0] = ("label_check", p[1], p[3])
+        summary = _summary(p)
+        if summary is not None:
+            summary.labels[p[3]] += 1
 
     def p_expression_map(self, p):
         "expression : LBRACE property_list RBRACE"
@@ -737,11 +1088,15 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_projection_item_shorthand(self, p):
         "projection_item : DOT IDENTIFIER"
         p[0] = ("projection_shorthand", p[2])
+        summary = _summary(p)
+        if summary is not None:
+            summary.property_keys[p[2]] += 1
 
     def p_projection_item_alias(self, p):
         "projection_item : IDENTIFIER COLON expression"
@@ -777,7 +1132,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_order_item(self, p):
         """order_item : expression
@@ -814,7 +1170,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
 
     def p_case_else_opt(self, p):
         """case_else_opt :
@@ -872,7 +1229,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_detach_delete_clause(self, p):
         "detach_delete_clause : DETACH DELETE delete_items"
@@ -889,6 +1247,9 @@ class CypherParser:
     def p_set_item_label(self, p):
         "set_item : IDENTIFIER COLON IDENTIFIER"
         p[0] = ("set_label", p[1], p[3])
+        summary = _summary(p)
+        if summary is not None:
+            summary.labels[p[3]] += 1
 
     def p_set_item_labels(self, p):
         "set_item : IDENTIFIER label_list"
@@ -897,10 +1258,17 @@ class CypherParser:
     def p_label_list_single(self, p):
         "label_list : COLON IDENTIFIER"
         p[0] = [p[2]]
+        summary = _summary(p)
+        if summary is not None:
+            summary.labels[p[2]] += 1
 
     def p_label_list_multiple(self, p):
         "label_list : label_list COLON IDENTIFIER"
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
+        summary = _summary(p)
+        if summary is not None:
+            summary.labels[p[3]] += 1
 
     def p_remove_clause(self, p):
         "remove_clause : REMOVE remove_items"
@@ -912,7 +1280,8 @@ class CypherParser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_remove_item_property(self, p):
         "remove_item : property_access"
@@ -953,7 +1322,8 @@ class CypherParser:
 
     def p_yield_items_multiple(self, p):
         "yield_items : yield_items COMMA yield_item"
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
     def p_yield_item(self, p):
         """yield_item : IDENTIFIER
@@ -973,6 +1343,318 @@ class CypherParser:
         | WHERE expression"""
         p[0] = p[2] if len(p) > 1 else None
 
+    def _acquire(self):
+        """
+        Borrow a lexer/parser pair for one parse.
+
+        list.pop() and list.append() are atomic, so the pool needs no lock.
+        Clones share the master regex and the LALR tables with self.lexer and
+        self.parser and only carry their own input position and stacks.
+        """
+        try:
+            return self._pool.pop()
+        except IndexError:
+            return _ParseState(self.lexer.lexer.clone(), copy.copy(self.parser))
+
+    def _run(self, data, tokens=None, on_error="print", summary=None):
+        """
+        Parse on a borrowed state, from text, a TokenStream or a token list
+        of either, and return ``(result, errors)``; errors is None if there
+        were none.  The grammar actions fill in summary, a QuerySummary.
+        """
+        state = self._acquire()
+        try:
+            if isinstance(data, TokenStream):
+                state.begin(data.text, on_error, summary)
+                if tokens is None:
+                    tokens = data.tokens(state.error)
+            else:
+                state.begin(data, on_error, summary)
+            try:
+                if tokens is None:
+                    result = state.parser.parse(data, lexer=state.lexer)
+                else:
+                    tokenfunc = functools.partial(next, iter(tokens), None)
+                    result = state.parser.parse(lexer=state.lexer, tokenfunc=tokenfunc)
+            except _Abandon:
+                result = None
+            return result, state.errors
+        finally:
+            state.data = state.summary = None
+            self._pool.append(state)
+
+    def _tokenize(self, data, on_error="print"):
+        """Lex data into a list of token objects, returning (tokens, errors)."""
+        state = self._acquire()
+        try:
+            if isinstance(data, TokenStream):
+                state.begin(data.text, on_error)
+                return list(data.tokens(state.error)), state.errors
+            state.begin(data, on_error)
+            state.lexer.input(data)
+            return list(iter(state.lexer.token, None)), state.errors
+        finally:
+            state.data = None
+            self._pool.append(state)
+
+    def _template(self, data, on_error):
+        """parse_template() that also returns the errors."""
+        tokens, errors = self._tokenize(data, on_error)
+        literals = []
+        key = []
+        for tok in tokens:
+            if tok.type in self.literal_tokens:
+                tok.value, value = Slot(len(literals)), tok.value
+                literals.append(value)
+                key.append(tok.type)
+            else:
+                key.append((tok.type, tok.value))
+        key = tuple(key)
+
+        template = MISSING
+        if self._cache is not None and not errors:
+            template = self._cache.get(key)
+        if template is MISSING:
+            try:
+                ast, more = self._run(data, tokens, on_error)
+            except TypeError:
+                # A grammar action needed the literal's value (such as the
+                # bounds in -[*1..3]-); this shape cannot be shared.
+                template = _UNSHAREABLE
+            else:
+                template = None if ast is None else QueryTemplate(freeze(ast))
+                if errors or more:
+                    return template, literals, (errors or []) + (more or [])
+            if self._cache is not None:
+                self._cache.put(key, template)
+
+        if template is _UNSHAREABLE:
+            for tok in tokens:
+                if isinstance(tok.value, Slot):
+                    tok.value = literals[tok.value.index]
+            ast, more = self._run(data, tokens, on_error)
+            template = None if ast is None else QueryTemplate(freeze(ast))
+            return template, [], (errors or []) + (more or []) or None
+        return template, literals, errors
+
+    def parse_template(self, data):
+        """
+        Parse the shape of a query and return ``(template, literals)``.
+
+        NUMBER and STRING tokens are replaced by Slot placeholders before
+        parsing, so every query with the same shape yields the same
+        QueryTemplate, parsed once when caching is enabled.  ``literals``
+        holds the values taken out of this query, in order, and
+        ``template.fill(literals)`` rebuilds its full parse result.
+        Returns ``(None, literals)`` if the query does not parse.
+        """
+        template, literals, _ = self._template(data, self.on_error)
+        return template, literals
+
+    def _finish(self, result):
+        """Apply the fold_constants and intern passes to a fresh result."""
+        if result is not None:
+            if self._fold_constants:
+                result, _ = fold(result)
+            if self._intern:
+                result = Interner().intern(result)
+        return result
+
+    def _parse(self, data, on_error):
+        """Parse through the configured cache, returning (result, errors)."""
+        result, errors = self._parse_cached(data, on_error)
+        if self._typed_ast and result is not None:
+            result = to_nodes(result)
+        return result, errors
+
+    def _parse_cached(self, data, on_error):
+        if self._fingerprint:
+            template, literals, errors = self._template(data, on_error)
+            if template is None:
+                return None, errors
+            return self._finish(template.fill(literals)), errors
+        if self._cache is None:
+            result, errors = self._run(data, on_error=on_error)
+            return self._finish(result), errors
+        key = data.text if isinstance(data, TokenStream) else data
+        result = self._cache.get(key)
+        if result is not MISSING:
+            return result, None
+        result, errors = self._run(data, on_error=on_error)
+        result = self._finish(result)
+        if not self._intern:
+            result = freeze(result)
+        if result is not None and not errors:
+            self._cache.put(key, result)
+        return result, errors
+
     def parse(self, data):
-        """Parse the given Cypher query string."""
-        return self.parser.parse(data, lexer=self.lexer.lexer)
+        """
+        Parse the given Cypher query string, or a TokenStream returned by
+        CypherLexer.tokenize().
+
+        Syntax errors are handled as selected by ``on_error``.  Safe to call
+        concurrently on one instance: every call runs on its own lexer and
+        parser state, which is returned to a pool afterwards.
+        """
+        result, errors = self._parse(data, self.on_error)
+        if errors and self.on_error == "collect":
+            return errors[0]
+        return result
+
+    def parse_with_errors(self, data):
+        """
+        Parse data without printing and return ``(result, errors)``.
+
+        errors lists every CypherSyntaxError found, and is empty when the
+        query parsed cleanly; otherwise result is None or the partial tree
+        left by error recovery.
+        """
+        result, errors = self._parse(data, "collect")
+        return result, errors or []
+
+    def parse_with_spans(self, data):
+        """
+        Parse data without printing and return ``(result, spans, errors)``,
+        on a parser built with ``spans=True``.
+
+        spans is a pcypher.spans.SpanTable mapping each node of result to
+        the ``(start, end)`` offsets of its text in the query.  result and
+        errors are those of parse_with_errors(), except that the parse
+        bypasses the cache and the fold_constants and intern passes, which
+        replace and share nodes.
+        """
+        if self._spans is None:
+            raise ValueError("parse_with_spans() needs CypherParser(spans=True)")
+        from . import spans
+
+        return spans.parse(self, self._spans, data)
+
+    def parse_with_summary(self, data):
+        """
+        Parse data without printing and return ``(result, summary, errors)``.
+
+        summary is a pcypher.summary.QuerySummary of the parameters, labels,
+        relationship types and property keys the query uses, counted by the
+        grammar actions as they reduce, so no second walk over the result is
+        needed.  result and errors are those of parse_with_errors(), except
+        that the parse bypasses the cache, since the actions must run.
+        """
+        from .summary import QuerySummary
+
+        summary = QuerySummary()
+        result, errors = self._run(data, on_error="collect", summary=summary)
+        result = self._finish(result)
+        if self._typed_ast and result is not None:
+            result = to_nodes(result)
+        return result, summary, errors or []
+
+    def parse_incremental(self, text):
+        """
+        Parse text like parse_with_errors() and return a
+        pcypher.incremental.IncrementalState holding the result and errors.
+
+        Pass the state to reparse() after each edit of the text.
+        """
+        from . import incremental
+
+        return incremental.parse(self, text)
+
+    def reparse(self, state, offset, deleted, inserted):
+        """
+        Return the IncrementalState of state's text after replacing the
+        ``deleted`` characters at ``offset`` by the string ``inserted``.
+
+        Only the top-level clauses (MATCH, WITH, RETURN, ...) around the
+        edit are lexed and parsed again; the parses of the others are
+        reused.  The result equals that of parse_with_errors() on the new
+        text.  When the text does not parse cleanly, the whole text is
+        parsed, so errors are reported exactly as a full parse does.
+        """
+        from . import incremental
+
+        return incremental.reparse(self, state, offset, deleted, inserted)
+
+    def cache_info(self):
+        """Return the parse cache statistics, or None if caching is off."""
+        return None if self._cache is None else self._cache.info()
+
+    def cache_clear(self):
+        """Empty the parse cache."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _parse_or_error(self, data):
+        """Parse data, returning a failure as an exception object."""
+        try:
+            result, errors = self._parse(data, "collect")
+        except Exception as e:
+            return e
+        return errors[0] if errors else result
+
+    def parse_many(self, queries, workers=None, chunksize=64):
+        """
+        Parse an iterable of queries on a pool of worker processes.
+
+        Each worker builds one optimized parser with this parser's options
+        and receives queries in chunks of ``chunksize``.  Results come back
+        in input order; a query that fails yields its CypherSyntaxError (or
+        the exception it raised) in place of a parse result.  ``workers``
+        defaults to the CPU count; with 1 the queries are parsed in this
+        process.
+        """
+        import multiprocessing
+
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        if workers <= 1:
+            return [self._parse_or_error(query) for query in queries]
+        with multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(self._options,)
+        ) as pool:
+            return list(pool.imap(_parse_in_worker, queries, chunksize))
+
+    def iter_parse(self, stream, chunk_size=65536):
+        """
+        Parse the ;-separated statements of a text stream (or string) one at
+        a time, yielding a parse result or CypherSyntaxError per statement.
+
+        Input is read incrementally, so arbitrarily large dumps are parsed
+        in memory bounded by their longest statement.
+        """
+        from .statements import split_statements
+
+        for statement in split_statements(stream, chunk_size):
+            yield self._parse_or_error(statement)
+
+
+# Parser owned by a parse_many() worker process.
+_worker_parser = None
+
+
+def _init_worker(options):
+    global _worker_parser
+    _worker_parser = CypherParser(optimize=True, **options)
+
+
+def _parse_in_worker(data):
+    return _worker_parser._parse_or_error(data)
+
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser():
+    """
+    Return the process-wide CypherParser, building it on first use.
+
+    The parser is created in optimized mode, so the packaged tables are
+    loaded once and never regenerated.
+    """
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = CypherParser(optimize=True)
+    return _parser
@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import Counter
+
+import ply.yacc as yacc
+
+from .nodes import to_nodes
+
+
+class ParseProfile:
+    """
+    Timings and counts of one parse, handed to the profile callback.
+
+    Seconds spent in each phase:
+
+      ``lex``      lexing the query text
+      ``parse``    the LALR driver: shifts, reductions and error recovery,
+                   without the grammar actions
+      ``actions``  the p_* grammar actions
+      ``post``     post-parse passes: fold_constants, intern and typed_ast
+      ``total``    the whole call, including cache lookups
+
+    ``tokens`` counts the tokens lexed, ``reductions`` maps each p_* action
+    name to the times it ran, and ``action_times`` to its seconds in total.
+    A result served from the cache reports no lexing or parsing, and a
+    TokenStream input, lexed beforehand by tokenize(), reports no lexing.
+    """
+
+    __slots__ = (
+        "lex",
+        "parse",
+        "actions",
+        "post",
+        "total",
+        "tokens",
+        "reductions",
+        "action_times",
+    )
+
+    def __init__(self):
+        self.lex = self.parse = self.actions = self.post = self.total = 0.0
+        self.tokens = 0
+        self.reductions = Counter()
+        self.action_times = Counter()
+
+    def as_dict(self):
+        """Return the profile as a dict of plain values, e.g. for JSON."""
+        return {
+            "lex": self.lex,
+            "parse": self.parse,
+            "actions": self.actions,
+            "post": self.post,
+            "total": self.total,
+            "tokens": self.tokens,
+            "reductions": dict(self.reductions),
+            "action_times": dict(self.action_times),
+        }
+
+    def __repr__(self):
+        return (
+            f"ParseProfile(total={self.total:.6f}, lex={self.lex:.6f}, "
+            f"parse={self.parse:.6f}, actions={self.actions:.6f}, "
+            f"post={self.post:.6f}, tokens={self.tokens})"
+        )
+
+
+class Profiler:
+    """
+    Profile callback summing the ParseProfiles of many parses.
+
+    Pass an instance as ``CypherParser(profile=...)``; it is thread-safe.
+    report() formats the totals, with the costliest grammar actions first.
+    """
+
+    PHASES = ("lex", "parse", "actions", "post", "total")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.totals = ParseProfile()
+
+    def __call__(self, profile):
+        with self._lock:
+            totals = self.totals
+            self.parses += 1
+            for phase in self.PHASES:
+                setattr(totals, phase, getattr(totals, phase) + getattr(profile, phase))
+            totals.tokens += profile.tokens
+            totals.reductions.update(profile.reductions)
+            totals.action_times.update(profile.action_times)
+
+    def report(self, limit=10):
+        """Return the totals and the ``limit`` costliest actions as text."""
+        with self._lock:
+            totals = self.totals
+            lines = [f"{self.parses} parses, {totals.tokens} tokens"]
+            for phase in self.PHASES:
+                lines.append(f"  {phase:8} {getattr(totals, phase) * 1e3:10.3f} ms")
+            lines.append(f"  {'action':32} {'calls':>8} {'ms':>10}")
+            for name, seconds in totals.action_times.most_common(limit):
+                calls = totals.reductions[name]
+                lines.append(f"  {name:32} {calls:8} {seconds * 1e3:10.3f}")
+        return "\n".join(lines)
+
+
+class _ProfiledLRParser(yacc.LRParser):
+    """LRParser timing the lexer it pulls tokens from; see instrument()."""
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        profile = self.profiles.current
+        if profile is None:
+            return super().parse(input, lexer, debug, tracking, tokenfunc)
+        if input is not None:
+            lexer.input(input)
+        lexed = 0.0
+        count = 0
+        perf_counter = time.perf_counter
+        if tokenfunc is None:
+            token = lexer.token
+
+            def tokenfunc():
+                nonlocal lexed, count
+                start = perf_counter()
+                tok = token()
+                lexed += perf_counter() - start
+                if tok is not None:
+                    count += 1
+                return tok
+
+        actions = profile.actions
+        start = perf_counter()
+        try:
+            return super().parse(None, lexer, debug, tracking, tokenfunc)
+        finally:
+            elapsed = perf_counter() - start
+            profile.lex += lexed
+            profile.tokens += count
+            profile.parse += elapsed - lexed - (profile.actions - actions)
+
+
+class _Profiles(threading.local):
+    """
+    The ParseProfile of the parse running on each thread, in ``current``.
+    A class attribute, so threads that never started a parse see None too.
+    """
+
+    current = None
+
+
+def _timed_action(name, func, profiles):
+    """Wrap grammar action func to count and time its reductions."""
+    perf_counter = time.perf_counter
+
+    def action(p):
+        profile = profiles.current
+        start = perf_counter()
+        try:
+            func(p)
+        finally:
+            if profile is not None:
+                elapsed = perf_counter() - start
+                profile.actions += elapsed
+                profile.reductions[name] += 1
+                profile.action_times[name] += elapsed
+
+    return action
+
+
+def instrument(parser, callback):
+    """
+    Make CypherParser parser call callback with a ParseProfile per parse.
+
+    The instrumentation lives in instance attributes and in the class of
+    parser's LRParser, so uninstrumented parsers run the plain code paths.
+    Only parses through parse() and parse_with_errors() are reported.
+    """
+    profiles = _Profiles()
+    lr = parser.parser
+    lr.__class__ = _ProfiledLRParser
+    lr.profiles = profiles
+    for prod in lr.productions:
+        if prod.callable is not None:
+            prod.callable = _timed_action(prod.func, prod.callable, profiles)
+
+    run_tokenize = parser._tokenize
+    run_finish = parser._finish
+    perf_counter = time.perf_counter
+
+    def _tokenize(data, on_error="print"):
+        profile = profiles.current
+        start = perf_counter()
+        tokens, errors = run_tokenize(data, on_error)
+        if profile is not None:
+            profile.lex += perf_counter() - start
+            profile.tokens += len(tokens)
+        return tokens, errors
+
+    def _finish(result):
+        profile = profiles.current
+        start = perf_counter()
+        result = run_finish(result)
+        if profile is not None:
+            profile.post += perf_counter() - start
+        return result
+
+    def _parse(data, on_error):
+        profile = profiles.current = ParseProfile()
+        start = perf_counter()
+        try:
+            result, errors = parser._parse_cached(data, on_error)
+            if parser._typed_ast and result is not None:
+                converted = perf_counter()
+                result = to_nodes(result)
+                profile.post += perf_counter() - converted
+        finally:
+            profile.total = perf_counter() - start
+            profiles.current = None
+            callback(profile)
+        return result, errors
+
+    parser._tokenize = _tokenize
+    parser._finish = _finish
+    parser._parse = _parse
@@ -0,0 +1,205 @@
+import threading
+from array import array
+
+from .nodes import Node, to_nodes
+from .tokens import Token, TokenStream
+
+_CONTAINERS = (tuple, list, dict)
+
+
+class SpanTable:
+    """
+    Source offsets of the nodes of one parse result.
+
+    Returned by CypherParser.parse_with_spans() next to the result, which
+    keeps its usual form: the spans live here, in parallel arrays indexed
+    by node identity, so results of other parses carry nothing extra.
+
+    Every tuple, list, dict or Node built from at least one token has a
+    span: ``table[node]`` gives ``(start, end)``, the offsets of the text
+    from its first token to its last in ``text``, and ``table.source(node)``
+    that text.  Offsets index the query string, as CypherSyntaxError.lexpos
+    does.  Strings and numbers are shared values, not nodes, and have none.
+    A node appearing more than once in the tree, such as the ``("star",)``
+    of several ``count(*)``, has the span of its first occurrence.
+    """
+
+    __slots__ = ("text", "_index", "_nodes", "_starts", "_ends")
+
+    def __init__(self, text):
+        self.text = text
+        # id() of a node -> its position in the arrays below.  _nodes keeps
+        # the nodes alive, so their ids stay unique.
+        self._index = {}
+        self._nodes = []
+        self._starts = array("I")
+        self._ends = array("I")
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return id(node) in self._index
+
+    def __getitem__(self, node):
+        i = self._index.get(id(node))
+        if i is None:
+            raise KeyError(node)
+        return self._starts[i], self._ends[i]
+
+    def __repr__(self):
+        return f"<SpanTable of {len(self)} nodes>"
+
+    def get(self, node, default=None):
+        """Return the ``(start, end)`` of node, or default if it has none."""
+        i = self._index.get(id(node))
+        return default if i is None else (self._starts[i], self._ends[i])
+
+    def source(self, node):
+        """Return the query text node was parsed from."""
+        start, end = self[node]
+        return self.text[start:end]
+
+    def _collect(self, spans, old, new):
+        """
+        Add the spans recorded for the nodes of tree old, which to_nodes()
+        may have turned into tree new, keyed by the nodes of new.  Recorded
+        spans of containers that did not make it into the tree are dropped.
+        """
+        index = self._index
+        stack = [(old, new)]
+        while stack:
+            old, new = stack.pop()
+            span = spans.get(id(old))
+            if span is not None and id(new) not in index:
+                index[id(new)] = len(self._nodes)
+                self._nodes.append(new)
+                self._starts.append(span[1])
+                self._ends.append(span[2])
+            if isinstance(new, Node):
+                if isinstance(old, tuple):
+                    pairs = zip(old[1:], new.children())
+                else:
+                    continue  # A RelationshipType or Range, from a dict.
+            elif isinstance(old, dict):
+                pairs = zip(old.values(), new.values())
+            else:
+                pairs = zip(old, new)
+            stack.extend(
+                pair for pair in pairs if isinstance(pair[0], (tuple, list, dict))
+            )
+
+
+def _record(symbols, ends, spans):
+    """Give the left-hand symbol of a reduction, and its value, their span."""
+    # (value, start, end) of each right-hand symbol that matched tokens.
+    extents = []
+    for i in range(1, len(symbols)):
+        sym = symbols[i]
+        if sym.__class__ is Token:
+            extents.append((sym.value, sym.lexpos, ends[sym.lexpos]))
+        else:
+            # A nonterminal, which has a span unless it matched no tokens,
+            # or a symbol inserted by error recovery.
+            span = getattr(sym, "span", None)
+            if span is not None:
+                extents.append((sym.value, span[0], span[1]))
+    result = symbols[0]
+    if not extents:
+        result.span = None
+        return
+    start = extents[0][1]
+    end = extents[-1][2]
+    result.span = (start, end)
+    value = result.value
+    cls = value.__class__
+    if cls is tuple:
+        # A tuple passed up unchanged, as by ``LPAREN expression RPAREN``,
+        # keeps the span of what built it.
+        if value and id(value) not in spans:
+            spans[id(value)] = (value, start, end)
+        built = value
+    elif cls is list:
+        # Lists grow in place as their rules recur; keep the latest, widest
+        # span.  Only the last item can be new.
+        spans[id(value)] = (value, start, end)
+        built = value[-1:]
+    elif cls is dict:
+        spans[id(value)] = (value, start, end)
+        built = ()
+    else:
+        return
+    # Containers the action built around right-hand values, such as the
+    # (relationship, node) steps of a chain, span those values.
+    for child in built:
+        if child.__class__ in _CONTAINERS and child and id(child) not in spans:
+            _record_built(child, extents, spans)
+
+
+def _record_built(node, extents, spans):
+    """Record the span of the right-hand values found in node."""
+    members = {id(item) for item in (node.values() if isinstance(node, dict) else node)}
+    start = end = None
+    for value, first, last in extents:
+        if id(value) in members or (
+            value.__class__ is list and any(id(item) in members for item in value)
+        ):
+            if start is None:
+                start = first
+            end = last
+    if start is not None:
+        spans[id(node)] = (node, start, end)
+
+
+class _Current(threading.local):
+    """
+    What parse_with_spans() is recording on each thread, in ``spans``.  A
+    class attribute, so threads that never started one see None too.
+    """
+
+    spans = None
+
+
+def _spanned_action(func, current):
+    """Wrap grammar action func to record spans during parse_with_spans()."""
+
+    def action(p):
+        func(p)
+        spans = current.spans
+        if spans is not None:
+            _record(p.slice, spans[0], spans[1])
+
+    return action
+
+
+def instrument(parser):
+    """
+    Wrap the grammar actions of CypherParser parser to record spans.
+
+    Returns the thread-local the wrappers read: its ``spans`` is None, so
+    they only call the action, except inside parse().
+    """
+    current = _Current()
+    for prod in parser.parser.productions:
+        if prod.callable is not None:
+            prod.callable = _spanned_action(prod.callable, current)
+    return current
+
+
+def parse(parser, current, data):
+    """Parse data on an instrumented parser; return (result, SpanTable, errors)."""
+    stream = data if isinstance(data, TokenStream) else parser.lexer.tokenize(data)
+    # Recorded spans: id() of a container -> (container, start, end).  The
+    # container is kept alive so that its id is not reused during the parse.
+    spans = {}
+    current.spans = (dict(zip(stream.starts, stream.ends)), spans)
+    try:
+        result, errors = parser._run(stream, on_error="collect")
+    finally:
+        current.spans = None
+    table = SpanTable(stream.text)
+    if result is not None:
+        new = to_nodes(result) if parser._typed_ast else result
+        table._collect(spans, result, new)
+        result = new
+    return result, table, errors or []
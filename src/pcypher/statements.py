@@ -0,0 +1,96 @@
+import io
+import re
+
+from .pcypher import CypherLexer
+
+# The splitter reuses the lexer's own rules, so it sees strings, backtick
+# identifiers and comments exactly where CypherLexer does.
+_STRING = re.compile(CypherLexer.t_STRING.__doc__, re.VERBOSE)
+_BACKTICK = re.compile(CypherLexer.t_BACKTICK_IDENTIFIER.__doc__, re.VERBOSE)
+
+# Characters that may start a semicolon, a string, an identifier in
+# backticks or a comment.  Nothing else can hide a semicolon.
+_SPECIAL = re.compile(r"""[;'"`/]""")
+
+
+def _skip(buf, i, eof):
+    """
+    Return the index just past the construct starting at buf[i], with a
+    flag telling whether it is a comment, or None if buf ends before the
+    construct can be decided and more input is available.
+    """
+    c = buf[i]
+    if c in "'\"":
+        m = _STRING.match(buf, i)
+        if m:
+            return m.end(), False
+        # Strings cannot span lines: past a newline the quote is just an
+        # illegal character to the lexer.
+        if eof or buf.find("\n", i) != -1:
+            return i + 1, False
+        return None
+    if c == "`":
+        m = _BACKTICK.match(buf, i)
+        if m:
+            return m.end(), False
+        return (i + 1, False) if eof else None
+    # c == "/"
+    if i + 1 == len(buf):
+        return (i + 1, False) if eof else None
+    if buf[i + 1] == "/":
+        end = buf.find("\n", i)
+        if end == -1:
+            return (len(buf), True) if eof else None
+        return end, True
+    if buf[i + 1] == "*":
+        end = buf.find("*/", i + 2)
+        if end == -1:
+            return (i + 1, False) if eof else None
+        return end + 2, True
+    return i + 1, False
+
+
+def split_statements(stream, chunk_size=65536):
+    """
+    Yield the ;-separated statements read from a text stream or string.
+
+    The input is read ``chunk_size`` characters at a time, so memory stays
+    bounded by the longest statement.  Semicolons inside strings, backtick
+    identifiers and comments do not split; statements that hold nothing but
+    whitespace and comments are skipped.
+    """
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+    buf = ""
+    start = pos = 0  # Current statement start and scan position in buf.
+    has_code = False
+    eof = False
+    while True:
+        m = _SPECIAL.search(buf, pos)
+        if m is None:
+            has_code = has_code or not buf[pos:].isspace() and pos < len(buf)
+            pos = len(buf)
+        else:
+            i = m.start()
+            has_code = has_code or not buf[pos:i].isspace() and pos < i
+            if buf[i] == ";":
+                if has_code:
+                    yield buf[start:i].strip()
+                start = pos = i + 1
+                has_code = False
+                continue
+            skipped = _skip(buf, i, eof)
+            if skipped is not None:
+                pos, comment = skipped
+                has_code = has_code or not comment
+                continue
+            pos = i
+        if eof:
+            break
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buf = buf[start:] + chunk
+        pos -= start
+        start = 0
+    if has_code:
+        yield buf[start:].strip()
@@ -0,0 +1,117 @@
+from collections import Counter
+
+from .visitor import Visitor
+
+
+class QuerySummary:
+    """
+    What one query refers to, collected by the grammar actions as they run.
+
+    Returned by CypherParser.parse_with_summary() next to the result.  Each
+    attribute is a Counter from a name to the times the query mentions it,
+    so ``set(summary.params)`` is the set of names and ``summary.params[n]``
+    a count:
+
+      ``params``              ``$name`` parameters, in expressions and as
+                              node property maps
+      ``labels``              node labels in patterns, label checks
+                              (``n:Label``) and SET/REMOVE items
+      ``relationship_types``  relationship types in patterns
+      ``property_keys``       keys of property maps and map literals,
+                              property lookups (``n.key``) and map
+                              projection shorthands (``n {.key}``)
+
+    Names are counted as written in the query, whatever the constant
+    folding pass later makes of the expressions holding them.
+    """
+
+    __slots__ = ("params", "labels", "relationship_types", "property_keys")
+
+    def __init__(self):
+        self.params = Counter()
+        self.labels = Counter()
+        self.relationship_types = Counter()
+        self.property_keys = Counter()
+
+    def as_dict(self):
+        """Return the summary as a dict of plain dicts, e.g. for JSON."""
+        return {
+            "params": dict(self.params),
+            "labels": dict(self.labels),
+            "relationship_types": dict(self.relationship_types),
+            "property_keys": dict(self.property_keys),
+        }
+
+    def __eq__(self, other):
+        if not isinstance(other, QuerySummary):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"QuerySummary(params={dict(self.params)!r}, "
+            f"labels={dict(self.labels)!r}, "
+            f"relationship_types={dict(self.relationship_types)!r}, "
+            f"property_keys={dict(self.property_keys)!r})"
+        )
+
+
+class _Summarizer(Visitor):
+    """Visitor filling in a QuerySummary; see summarize()."""
+
+    def __init__(self):
+        self.summary = QuerySummary()
+
+    def visit_param(self, node):
+        self.summary.params[node[1]] += 1
+
+    visit_node_param = visit_param
+
+    def visit_node(self, node):
+        self.summary.labels.update(node[2])
+        if isinstance(node[3], list):
+            self.summary.property_keys.update(key for key, _ in node[3])
+
+    def visit_relationship(self, node):
+        self.summary.relationship_types.update(
+            entry["type"] for entry in node[1] if entry["type"] is not None
+        )
+        if isinstance(node[3], list):
+            self.summary.property_keys.update(key for key, _ in node[3])
+
+    def visit_map(self, node):
+        self.summary.property_keys.update(key for key, _ in node[1])
+
+    def visit_property(self, node):
+        self.summary.property_keys[node[2]] += 1
+
+    visit_property_access = visit_property
+
+    def visit_projection_shorthand(self, node):
+        self.summary.property_keys[node[1]] += 1
+
+    def visit_label_check(self, node):
+        self.summary.labels[node[2]] += 1
+
+    visit_set_label = visit_label_check
+
+    def visit_set_labels(self, node):
+        self.summary.labels.update(node[2])
+
+    visit_remove_labels = visit_set_labels
+
+
+def summarize(result):
+    """
+    Return the QuerySummary of a tuple-form parse result, by walking it.
+
+    parse_with_summary() gets the same summary from the grammar actions
+    without this second traversal; summarize() serves results parsed
+    without it.  Constant folding may drop names from a result, so the
+    summary of a folded result can count fewer.
+    """
+    summarizer = _Summarizer()
+    summarizer.walk(result)
+    return summarizer.summary
@@ -0,0 +1,125 @@
+from array import array
+
+from .errors import CypherSyntaxError
+
+
+class Token:
+    """
+    A token with the attributes yacc reads from PLY's LexToken.
+    """
+
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class TokenStream:
+    """
+    Tokens of one query in columnar form, as returned by
+    CypherLexer.tokenize().
+
+    ``types`` holds type ids (indexes into ``names``, the lexer's token
+    list) in an ``array('H')``; ``starts`` and ``ends`` hold the offsets of
+    each token's text in ``text`` in ``array('I')``.  Values are derived
+    from the text only when value() asks for them.  ``errors`` lists the
+    CypherSyntaxError of every illegal character skipped.
+
+    CypherParser.parse() accepts a TokenStream in place of the query text,
+    so one tokenization can be inspected and then parsed without lexing
+    twice.
+    """
+
+    __slots__ = ("text", "names", "types", "starts", "ends", "errors")
+
+    def __init__(self, text, names):
+        self.text = text
+        self.names = names
+        self.types = array("H")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.errors = []
+
+    def __len__(self):
+        return len(self.types)
+
+    def __reduce__(self):
+        return _rebuild, (
+            self.text,
+            self.names,
+            self.types,
+            self.starts,
+            self.ends,
+            self.errors,
+        )
+
+    def error(self, message, lexpos, token=None, expected=None):
+        """Record a lexer error; the lexer reports to the stream while it fills it."""
+        self.errors.append(
+            CypherSyntaxError.at(message, self.text, lexpos, token, expected)
+        )
+
+    def type(self, i):
+        """Return the type name of the i-th token."""
+        return self.names[self.types[i]]
+
+    def source(self, i):
+        """Return the text of the i-th token as it appears in the query."""
+        return self.text[self.starts[i] : self.ends[i]]
+
+    def value(self, i):
+        """Return the value the lexer gives the i-th token."""
+        return _value(self.names[self.types[i]], self.source(i))
+
+    def tokens(self, report=None):
+        """
+        Yield the tokens as Token objects, for the parser.
+
+        Each recorded error is passed to ``report(message, lexpos, token)``
+        just before the first token that follows it, the order in which the
+        lexer would have reported it during a parse.
+        """
+        text = self.text
+        names = self.names
+        errors = self.errors if report is not None else ()
+        e = 0
+        lineno = 1
+        last = 0
+        for type, start, end in zip(self.types, self.starts, self.ends):
+            while e < len(errors) and errors[e].lexpos < start:
+                report(errors[e].message, errors[e].lexpos, errors[e].token)
+                e += 1
+            lineno += text.count("\n", last, start)
+            last = start
+            name = names[type]
+            yield Token(name, _value(name, text[start:end]), lineno, start)
+        for err in errors[e:]:
+            report(err.message, err.lexpos, err.token)
+
+
+def _value(type, text):
+    """Convert the text of a token to its value, as CypherLexer's rules do."""
+    if type == "NUMBER":
+        return float(text) if "." in text else int(text)
+    if type == "STRING":
+        return text[1:-1]
+    if type == "PARAM":
+        return text[1:]
+    if type == "IDENTIFIER" and text[:1] == "`":
+        return text[1:-1]
+    return text
+
+
+def _rebuild(text, names, types, starts, ends, errors):
+    stream = TokenStream(text, names)
+    stream.types = types
+    stream.starts = starts
+    stream.ends = ends
+    stream.errors = errors
+    return stream
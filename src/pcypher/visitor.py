@@ -0,0 +1,205 @@
+from .nodes import _PAIR_FIELDS, CLASSES
+
+# Returned by a visit_<tag>() method: do not descend into this node.
+SKIP = object()
+# Returned by a visit_<tag>() method: end the walk here.
+STOP = object()
+
+# Tag -> positions in the tagged tuple that hold lists of untagged pairs,
+# such as the (key, value) entries of a node's property map.  Their pairs
+# are walked item by item and never mistaken for tagged tuples.
+_PAIRS = {
+    tag: frozenset(i + 1 for i in _PAIR_FIELDS[cls]) for tag, cls in CLASSES.items()
+}
+
+# Marks a Transformer frame whose list holds untagged pairs.
+_PAIR_LIST = object()
+
+
+def _tag(node):
+    """Return the tag of a tagged tuple, or None."""
+    if node and node[0].__class__ is str and node[0] in _PAIRS:
+        return node[0]
+    return None
+
+
+class Visitor:
+    """
+    Pre-order walk over a tuple-form parse result, without recursion.
+
+    Subclasses define ``visit_<tag>(self, node)`` methods for the tags they
+    care about, e.g. visit_binop() or visit_MATCH(); generic_visit() is
+    called for tagged tuples without one.  A method may return SKIP to
+    leave the node's subtree out of the walk, or STOP to end it.  Lists,
+    untagged tuples and dicts are walked through without a call.
+
+    The tag -> method table is built once per class, so dispatch is a dict
+    lookup, and the walk keeps an explicit stack, so arbitrarily deep trees
+    (long AND chains, nested CASE) cannot hit the recursion limit.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visit = cls._table("visit_", cls.generic_visit)
+
+    @classmethod
+    def _table(cls, prefix, default):
+        """Return tag -> handler for every tag, leaving out no-op defaults."""
+        table = {}
+        for tag in _PAIRS:
+            handler = getattr(cls, prefix + tag, default)
+            if handler is not None:
+                table[tag] = handler
+        return table
+
+    # A handler of None means "no call"; subclasses may define a real one.
+    generic_visit = None
+
+    def walk(self, ast):
+        """
+        Visit every tagged tuple of ast in pre-order, left to right.
+
+        Returns the node whose method returned STOP, or None if the walk
+        covered the whole tree.
+        """
+        table = self._visit
+        stack = [ast]
+        pop = stack.pop
+        push = stack.append
+        while stack:
+            node = pop()
+            cls = node.__class__
+            if cls is str or node is None:
+                continue
+            if cls is not tuple and cls is not list:
+                if isinstance(node, tuple):
+                    cls = tuple
+                elif isinstance(node, list):
+                    cls = list
+                else:
+                    if isinstance(node, dict):
+                        stack.extend(reversed(list(node.values())))
+                    continue
+            if cls is list:
+                stack.extend(reversed(node))
+                continue
+            tag = node[0] if node else None
+            if tag.__class__ is not str or tag not in _PAIRS:
+                stack.extend(reversed(node))
+                continue
+            handler = table.get(tag)
+            if handler is not None:
+                action = handler(self, node)
+                if action is SKIP:
+                    continue
+                if action is STOP:
+                    return node
+            pairs = _PAIRS[tag]
+            if not pairs:
+                stack.extend(node[:0:-1])
+                continue
+            for i in range(len(node) - 1, 0, -1):
+                child = node[i]
+                if i in pairs and isinstance(child, list):
+                    for pair in reversed(child):
+                        stack.extend(reversed(pair))
+                else:
+                    push(child)
+        return None
+
+
+class Transformer(Visitor):
+    """
+    Bottom-up rewrite of a tuple-form parse result, without recursion.
+
+    Subclasses define ``transform_<tag>(self, node)`` methods returning the
+    replacement for node (or node itself); when one is called, the node's
+    children have been transformed already.  Containers are rebuilt only
+    on the path to a replaced node, everything else is shared with the
+    input.  visit_<tag>() methods run on the way down as in Visitor: SKIP
+    keeps a subtree as it is, and STOP keeps every node not transformed yet.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._transform = cls._table("transform_", None)
+
+    def transform(self, ast):
+        """Return ast with every transform_<tag>() method applied."""
+        visit = self._visit
+        transform = self._transform
+        stopped = False
+        # Frames: [container, tag, children, next child, new children, pairs]
+        # where pairs is _PAIRS[tag] for a tagged tuple and _PAIR_LIST for a
+        # list of untagged pairs.  Leaves are copied to the new children
+        # without a frame of their own.
+        root = [None, None, (ast,), 0, [], None]
+        stack = [root]
+        while stack:
+            frame = stack[-1]
+            _, _, items, i, new, pairs = frame
+            while i < len(items):
+                child = items[i]
+                i += 1
+                cls = child.__class__
+                if cls is str or child is None:
+                    new.append(child)
+                    continue
+                if isinstance(child, tuple):
+                    tag = None if pairs is _PAIR_LIST else _tag(child)
+                    if tag is not None and not stopped:
+                        handler = visit.get(tag)
+                        if handler is not None:
+                            action = handler(self, child)
+                            if action is SKIP:
+                                new.append(child)
+                                continue
+                            if action is STOP:
+                                stopped = True
+                    if tag is None:
+                        children, child_pairs = child, None
+                    else:
+                        children, child_pairs = child[1:], _PAIRS[tag]
+                elif isinstance(child, list):
+                    tag = None
+                    children = child
+                    if pairs is not None and pairs is not _PAIR_LIST and i in pairs:
+                        child_pairs = _PAIR_LIST
+                    else:
+                        child_pairs = None
+                elif isinstance(child, dict):
+                    tag = None
+                    children, child_pairs = list(child.values()), None
+                else:
+                    new.append(child)
+                    continue
+                frame[3] = i
+                stack.append([child, tag, children, 0, [], child_pairs])
+                break
+            else:
+                stack.pop()
+                if frame is root:
+                    return new[0]
+                node, tag, items = frame[:3]
+                if any(a is not b for a, b in zip(new, items)):
+                    node = _rebuild(node, tag, new)
+                if tag is not None and not stopped:
+                    handler = transform.get(tag)
+                    if handler is not None:
+                        node = handler(self, node)
+                stack[-1][4].append(node)
+
+
+Visitor._visit = {}
+Transformer._transform = {}
+
+
+def _rebuild(node, tag, new):
+    """Return a copy of node with its children replaced by new."""
+    if isinstance(node, dict):
+        return type(node)(zip(node.keys(), new))
+    if isinstance(node, list):
+        return type(node)(new)
+    if tag is not None:
+        return (tag,) + tuple(new)
+    return tuple(new)
@@ -0,0 +1,38 @@
+import threading
+
+import pytest
+
+
+def and_chain(terms):
+    """Return a query whose WHERE is an AND of terms comparisons."""
+    where = " AND ".join(f"n.p{i} = {i}" for i in range(terms))
+    return f"MATCH (n) WHERE {where} RETURN n"
+
+
+def in_new_thread(func, *args):
+    """Return func(*args) called on a new thread, re-raising what it raises."""
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((True, func(*args)))
+        except BaseException as exc:  # Re-raised on the calling thread.
+            outcome.append((False, exc))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    [(ok, value)] = outcome
+    if not ok:
+        raise value
+    return value
+
+
+@pytest.fixture
+def deep_query():
+    """
+    A 250-term AND chain: a parse result about 750 levels deep, beyond what
+    code recursing once or twice per level survives, yet shallow enough
+    for == on results, which recurses in C.
+    """
+    return and_chain(250)
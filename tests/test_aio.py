@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+import pytest
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.aio import AsyncCypherParser
+
+QUERY = "MATCH (n:Person) WHERE n.age > 30 RETURN n.name"
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class Gate:
+    """Stand-in for AsyncCypherParser._call that holds parses until opened."""
+
+    def __init__(self, call):
+        self.call = call
+        self.opened = threading.Event()
+        self.lock = threading.Lock()
+        self.running = self.most = self.calls = 0
+
+    def __call__(self, data):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.most = max(self.most, self.running)
+        try:
+            self.opened.wait(10)
+            return self.call(data)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+async def settle():
+    """Give submitted work time to reach the executor."""
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+def test_workers():
+    parser = AsyncCypherParser(workers=3)
+    assert parser.workers == parser.max_in_flight == 3
+    parser.close()
+    for executor in ("thread", "process"):
+        parser = AsyncCypherParser(executor)
+        assert parser.workers >= 1
+        assert parser.max_in_flight == parser.workers
+        parser.close()
+
+
+@pytest.mark.parametrize("inline_limit", [0, 1 << 20])
+def test_results(inline_limit):
+    expected = [CypherParser(optimize=True).parse(query) for query in data_list]
+
+    async def main():
+        async with AsyncCypherParser(inline_limit=inline_limit) as parser:
+            return await asyncio.gather(*(parser.parse(q) for q in data_list))
+
+    assert run(main()) == expected
+
+
+def test_process_executor():
+    async def main():
+        async with AsyncCypherParser("process", workers=1, inline_limit=0) as parser:
+            return await parser.parse(QUERY)
+
+    assert run(main()) == CypherParser(optimize=True).parse(QUERY)
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        AsyncCypherParser("fiber")
+
+
+def test_backpressure():
+    async def main():
+        async with AsyncCypherParser(workers=4, max_in_flight=2, inline_limit=0) as parser:
+            gate = parser._call = Gate(parser._call)
+            tasks = [asyncio.create_task(parser.parse(QUERY)) for _ in range(6)]
+            await settle()
+            # Two parses hold the slots; the rest wait without being submitted.
+            assert (gate.running, gate.calls) == (2, 2)
+            gate.opened.set()
+            results = await asyncio.gather(*tasks)
+            assert gate.most == 2 and gate.calls == 6
+            return results
+
+    assert run(main()) == [CypherParser(optimize=True).parse(QUERY)] * 6
+
+
+def test_cancellation():
+    async def main():
+        async with AsyncCypherParser(workers=1, max_in_flight=2, inline_limit=0) as parser:
+            gate = parser._call = Gate(parser._call)
+            running = asyncio.create_task(parser.parse(QUERY))
+            queued = asyncio.create_task(parser.parse(QUERY))
+            waiting = asyncio.create_task(parser.parse(QUERY))
+            await settle()
+            # One parse runs, one is queued in the executor, one waits for
+            # a slot.
+            assert gate.calls == 1
+            for task in (queued, waiting):
+                task.cancel()
+            await asyncio.gather(queued, waiting, return_exceptions=True)
+            assert queued.cancelled() and waiting.cancelled()
+            gate.opened.set()
+            await running
+            # The cancelled parses never ran, and their slots came back.
+            assert gate.calls == 1
+            await asyncio.gather(*(parser.parse(QUERY) for _ in range(4)))
+            assert gate.most == 1 and gate.calls == 5
+            return parser._slots._value
+
+    assert run(main()) == 2
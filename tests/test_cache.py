@@ -0,0 +1,43 @@
+import pytest
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.cache import FrozenDict, FrozenList, freeze, sizeof
+
+
+def test_cached_results_equal_uncached():
+    plain = CypherParser(optimize=True)
+    cached = CypherParser(optimize=True, cache_size=64)
+    for query in data_list:
+        expected = plain.parse(query)
+        assert cached.parse(query) == expected
+        assert cached.parse(query) == expected
+    assert cached.cache_info().hits == len(data_list)
+
+
+def test_freeze():
+    ast = ("MATCH", [("node", "n", ["A"], [("k", 1)])], {"min": 1, "max": [2]})
+    frozen = freeze(ast)
+    assert frozen == ast
+    assert type(frozen[1]) is FrozenList
+    assert type(frozen[2]) is FrozenDict
+    assert type(frozen[2]["max"]) is FrozenList
+    with pytest.raises(TypeError):
+        frozen[1].append(None)
+    with pytest.raises(TypeError):
+        frozen[2]["min"] = 0
+    assert freeze("n") == "n"
+
+
+def test_sizeof_counts_every_container():
+    leaf = [1, "a"]
+    assert sizeof([leaf, leaf]) > sizeof([leaf]) > sizeof(leaf)
+
+
+def test_deep_result_is_cached(deep_query):
+    expected = CypherParser(optimize=True).parse(deep_query)
+    parser = CypherParser(optimize=True, cache_size=4, cache_bytes=1 << 30)
+    assert parser.parse(deep_query) == expected
+    assert parser.parse(deep_query) == expected
+    info = parser.cache_info()
+    assert info.hits == 1 and info.currsize == 1 and info.currbytes > 0
@@ -0,0 +1,50 @@
+import pytest
+from conftest import and_chain
+from cypher_sample import data_list
+
+from pcypher import CypherParser, codec
+
+
+def test_round_trip():
+    parser = CypherParser(optimize=True)
+    for query in data_list:
+        result = parser.parse(query)
+        assert codec.loads(codec.dumps(result)) == result
+
+
+def test_rejects_other_types():
+    with pytest.raises(TypeError):
+        codec.dumps(("literal", b"bytes"))
+
+
+def test_deep_query():
+    # 600 terms are too deep for == (see deep_query), so compare encodings.
+    result = CypherParser(optimize=True).parse(and_chain(600))
+    data = codec.dumps(result)
+    assert codec.dumps(codec.loads(data)) == data
+
+
+def test_truncated():
+    data = codec.dumps(CypherParser(optimize=True).parse(data_list[0]))
+    for end in range(len(data)):
+        with pytest.raises(ValueError):
+            codec.loads(data[:end])
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"PCY\x02\x05",  # A string table cut short.
+        b"PCY\x01\x00\x30",  # A bad header.
+        b"PCY\x02\x00\x02\x30",  # A value shorter than its length.
+        b"PCY\x02\x00\x01\x13",  # A tuple of three items, with none before it.
+        b"PCY\x02\x00\x02\x09\x01",  # A dict of one pair, likewise.
+        b"PCY\x02\x00\x01\x45",  # A string past the end of the table.
+        b"PCY\x02\x00\x02\x05\x00",  # A float cut short.
+        b"PCY\x02\x00\x01\x0a",  # An unknown tag.
+        b"PCY\x02\x00\x02\x30\x30",  # Two values.
+    ],
+)
+def test_corrupt(data):
+    with pytest.raises(ValueError):
+        codec.loads(data)
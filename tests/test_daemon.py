@@ -0,0 +1,76 @@
+import argparse
+import io
+import json
+import os
+import threading
+import time
+
+import pytest
+from conftest import and_chain
+
+from pcypher import get_parser
+from pcypher.daemon import Client, serve
+from pcypher.jsonstream import read_json, write_json
+from pcypher.main import output
+
+QUERIES = [
+    "MATCH (n:Person) RETURN n.name",
+    # Recovered by the expression error rule, which prints its own line.
+    "MATCH (n) WHERE n.age > RETURN n",
+    "MATCH (n)\nRETURN n ~",
+    "RETURN",
+]
+
+
+@pytest.fixture(scope="module")
+def socket_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("daemon") / "pcypher.sock")
+    threading.Thread(target=serve, args=(path,), daemon=True).start()
+    for _ in range(500):
+        if os.path.exists(path):
+            return path
+        time.sleep(0.01)
+    pytest.fail("daemon did not start")
+
+
+@pytest.mark.parametrize("format", ["repr", "json", "ndjson"])
+def test_connect_prints_what_local_prints(socket_path, format, capsys):
+    output(QUERIES, argparse.Namespace(connect=None, format=format))
+    local = capsys.readouterr()
+    output(QUERIES, argparse.Namespace(connect=socket_path, format=format))
+    remote = capsys.readouterr()
+    assert remote.out == local.out
+    assert remote.err == local.err
+    if format == "repr":
+        assert "Syntax error in expression!" in local.out
+    else:
+        assert "(line 2, column" in local.err
+
+
+def test_unknown_format_rejected(socket_path):
+    with Client(socket_path) as client:
+        # Bypass the client's own check to reach the daemon's.
+        client._file.write(b'{"query": "RETURN 1", "format": "xml"}\n')
+        client._file.flush()
+        assert b"format must be one of" in client._file.readline()
+        assert client.parse("RETURN 1", "json")["result"] is not None
+
+
+def test_deep_result(socket_path, deep_query):
+    with Client(socket_path) as client:
+        response = client.parse(deep_query, "json")
+    result, errors = get_parser().parse_with_errors(deep_query)
+    assert not response["errors"] and not errors
+    assert response["result"] == json.loads(json.dumps(result))
+
+
+def test_deeper_result(socket_path):
+    # Deeper than the json module reads or writes.
+    query = and_chain(400)
+    with Client(socket_path) as client:
+        response = client.parse(query, "json")
+    # Too deep for == as well, so compare the JSON text.
+    local, remote = io.StringIO(), io.StringIO()
+    write_json(get_parser().parse(query), local)
+    write_json(response["result"], remote)
+    assert remote.getvalue() == local.getvalue()
@@ -0,0 +1,113 @@
+import pickle
+import threading
+
+import pytest
+
+from pcypher import CypherParser, CypherSyntaxError
+
+# Recovers through "expression : error" and prints a line for it.
+RECOVERED = "MATCH (n)\n  WHERE n.age > RETURN n"
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CypherParser(optimize=True, on_error="collect")
+
+
+def test_parse_error_fields(parser):
+    result, [error] = parser.parse_with_errors(RECOVERED)
+    assert result == [
+        ("MATCH", [("node", "n", [], None)], ("binop", ">", ("property", "n", "age"), None)),
+        ("RETURN", ["n"]),
+    ]
+    assert isinstance(error, CypherSyntaxError)
+    assert error.message == "Syntax error at 'RETURN'"
+    assert (error.line, error.column, error.lexpos) == (2, 17, 26)
+    assert error.token == "RETURN"
+    assert error.query == RECOVERED
+    assert "IDENTIFIER" in error.expected and "RETURN" not in error.expected
+    assert str(error) == "Syntax error at 'RETURN' (line 2, column 17)"
+
+
+def test_end_of_input(parser):
+    result, [error] = parser.parse_with_errors("MATCH (n) RETURN")
+    assert result is None
+    assert error.token is None
+    assert (error.line, error.column) == (1, 17)
+    assert error.expected
+
+
+def test_lexer_error_fields(parser):
+    result, [error] = parser.parse_with_errors("MATCH (n)\nRETURN n ~")
+    assert result == [("MATCH", [("node", "n", [], None)], None), ("RETURN", ["n"])]
+    assert error.message == "Illegal character '~'"
+    assert (error.line, error.column, error.token) == (2, 10, "~")
+    assert error.expected is None
+
+
+def test_pickle(parser):
+    _, [error] = parser.parse_with_errors(RECOVERED)
+    copy = pickle.loads(pickle.dumps(error))
+    assert str(copy) == str(error)
+    assert (copy.query, copy.token, copy.expected, copy.lexpos) == (
+        error.query,
+        error.token,
+        error.expected,
+        error.lexpos,
+    )
+
+
+def test_clean_parse(parser):
+    assert parser.parse_with_errors("MATCH (n) RETURN n")[1] == []
+
+
+def test_recovery_loop_abandoned(parser):
+    # Error recovery in front of the same ")" used to repeat forever.
+    outcome = []
+    thread = threading.Thread(
+        target=lambda: outcome.append(
+            parser.parse_with_errors("MATCH (n) WHERE n.x = ) RETURN n")
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "error recovery did not terminate"
+    [(result, errors)] = outcome
+    assert result is None
+    assert errors[0].token == ")"
+
+
+def test_print_mode(capsys):
+    result = CypherParser(optimize=True).parse(RECOVERED)
+    assert result is not None
+    assert capsys.readouterr().out == (
+        "Syntax error at 'RETURN'\nSyntax error in expression!\n"
+    )
+
+
+def test_collect_mode(parser, capsys):
+    error = parser.parse(RECOVERED)
+    assert isinstance(error, CypherSyntaxError)
+    assert error.token == "RETURN"
+    assert parser.parse("RETURN 1") == [("RETURN", [1])]
+    assert capsys.readouterr().out == ""
+
+
+def test_raise_mode(capsys):
+    parser = CypherParser(optimize=True, on_error="raise")
+    with pytest.raises(CypherSyntaxError) as info:
+        parser.parse(RECOVERED)
+    assert info.value.token == "RETURN"
+    assert parser.parse("RETURN 1") == [("RETURN", [1])]
+    assert capsys.readouterr().out == ""
+
+
+def test_parse_with_errors_does_not_print(capsys):
+    CypherParser(optimize=True).parse_with_errors(RECOVERED)
+    assert capsys.readouterr().out == ""
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        CypherParser(optimize=True, on_error="ignore")
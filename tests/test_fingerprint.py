@@ -0,0 +1,42 @@
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.cache import QueryTemplate, Slot
+
+
+def test_fingerprint_results_equal_plain():
+    plain = CypherParser(optimize=True)
+    parser = CypherParser(optimize=True, cache_size=256, fingerprint=True)
+    for _ in range(2):
+        for query in data_list:
+            assert parser.parse(query) == plain.parse(query)
+    assert parser.cache_info().hits > 0
+
+
+def test_literals_share_a_template():
+    parser = CypherParser(optimize=True, cache_size=16, fingerprint=True)
+    first, adam = parser.parse_template("MATCH (n {name: 'Adam', age: 1}) RETURN n")
+    second, eve = parser.parse_template("MATCH (n {name: 'Eve', age: 2}) RETURN n")
+    assert first is second
+    assert (adam, eve) == (["Adam", 1], ["Eve", 2])
+    assert first.fill(eve) == CypherParser(optimize=True).parse(
+        "MATCH (n {name: 'Eve', age: 2}) RETURN n"
+    )
+
+
+def test_fill_shares_clean_subtrees():
+    clean = ("node", "n", [], None)
+    template = QueryTemplate(("x", [clean, ("lit", Slot(0))]))
+    filled = template.fill([7])
+    assert filled == ("x", [clean, ("lit", 7)])
+    assert filled[1][0] is clean
+
+
+def test_deep_query(deep_query):
+    expected = CypherParser(optimize=True).parse(deep_query)
+    parser = CypherParser(optimize=True, cache_size=4, fingerprint=True)
+    assert parser.parse(deep_query) == expected
+    assert parser.parse(deep_query) == expected
+    template, literals = parser.parse_template(deep_query)
+    assert len(literals) == 250
+    assert template.fill(literals) == expected
@@ -0,0 +1,56 @@
+import pytest
+
+from pcypher import CypherParser
+from pcypher.fold import fold
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CypherParser(optimize=True, fold_constants=True)
+
+
+@pytest.mark.parametrize(
+    "expression, expected, eliminated",
+    [
+        ("range(0, 10)[0..3]", ("list", [0, 1, 2]), 1),
+        ("1 > 0.5", True, 1),
+        ("2^10 * 3", 3072.0, 2),
+        ("NOT NOT x", "x", 2),
+        ("-(-x)", "x", 2),
+        ("sqrt(16)", 4.0, 1),
+        ("null + 1", None, 1),
+        ("tail([1, 2])", ("list", [2]), 1),
+        ("reverse([1, 2])", ("list", [2, 1]), 1),
+        ("size([1, 2, [3]])", 3, 3),
+        # Left as they are: string functions, errors and unknown values.
+        ("toUpper('a')", ("func_call", "toUpper", ["a"]), 0),
+        ("1 / 0", ("binop", "/", 1, 0), 0),
+        ("x + 1", ("binop", "+", "x", 1), 0),
+    ],
+)
+def test_fold(expression, expected, eliminated):
+    result = CypherParser(optimize=True).parse(f"RETURN {expression}")
+    assert fold(result) == ([("RETURN", [expected])], eliminated)
+
+
+def test_fold_constants_option(parser):
+    assert parser.parse("RETURN 2^10 * 3") == [("RETURN", [3072.0])]
+
+
+def test_slice_folded(parser):
+    assert parser.parse("RETURN [1, 2, 3][0..2]") == [("RETURN", [("list", [1, 2])])]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # A null bound makes the slice null; it is not an omitted bound.
+        "RETURN [1, 2, 3][null..2]",
+        "RETURN [1, 2, 3][1..null]",
+        "RETURN [1, 2, 3][..2]",
+        "RETURN [1, 2, 3][1..]",
+    ],
+)
+def test_slice_with_none_bound_kept(parser, query):
+    [(_, [expression])] = parser.parse(query)
+    assert expression[0] == "slice"
@@ -0,0 +1,86 @@
+import pytest
+
+from pcypher import CypherParser
+
+QUERY = (
+    "MATCH (n:Person)\n"
+    "WHERE n.age > 30\n"
+    "WITH n ORDER BY n.name SKIP 1 LIMIT 10\n"
+    "RETURN n.name"
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CypherParser(optimize=True)
+
+
+def check(parser, state, offset, deleted, inserted):
+    """Apply an edit to state; check the new state against a full parse."""
+    state = parser.reparse(state, offset, deleted, inserted)
+    result, errors = parser.parse_with_errors(state.text)
+    assert state.result == result, state.text
+    assert [str(e) for e in state.errors] == [str(e) for e in errors]
+    return state
+
+
+def test_parse(parser):
+    state = parser.parse_incremental(QUERY)
+    assert state.text == QUERY
+    assert (state.result, state.errors) == parser.parse_with_errors(QUERY)
+
+
+def test_typing(parser):
+    # Every prefix of the query, most of which do not parse.
+    state = parser.parse_incremental("")
+    for i, char in enumerate(QUERY):
+        state = check(parser, state, i, 0, char)
+    assert state.text == QUERY
+
+
+def test_deleting(parser):
+    state = parser.parse_incremental(QUERY)
+    while state.text:
+        state = check(parser, state, len(state.text) // 2, 1, "")
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("30", "40"),
+        ("SKIP 1", "SKIP 2"),
+        ("LIMIT 10", "LIMIT 100"),
+        (" SKIP 1", ""),
+        ("RETURN n.name", "RETURN n.name LIMIT 5"),
+        ("RETURN n.name", "RETURN n.name UNION RETURN 1 AS name"),
+        ("(n:Person)", "(n:Person {name: 'Ann'})"),
+        ("WHERE", "WHER"),
+        ("\n", " "),
+    ],
+)
+def test_edits(parser, old, new):
+    state = parser.parse_incremental(QUERY)
+    offset = QUERY.index(old)
+    state = check(parser, state, offset, len(old), new)
+    # And back again.
+    check(parser, state, offset, len(new), old)
+
+
+def test_clauses_reused(parser):
+    state = parser.parse_incremental(QUERY)
+    match, with_, order, skip, limit, return_ = state.result
+    assert skip == ("SKIP", 1)
+    offset = QUERY.index("SKIP 1") + len("SKIP ")
+    new = check(parser, state, offset, 1, "2")
+    assert new.result[3] == ("SKIP", 2)
+    # Every clause but the edited one is the object parsed before.
+    for old_clause, new_clause in zip(state.result, new.result):
+        if old_clause is not skip:
+            assert new_clause is old_clause
+    assert new.result[3] is not skip
+
+
+def test_edit_outside_text(parser):
+    state = parser.parse_incremental("RETURN 1")
+    with pytest.raises(ValueError):
+        parser.reparse(state, 5, 10, "")
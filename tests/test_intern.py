@@ -0,0 +1,102 @@
+import subprocess
+import sys
+
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.intern import Interner, intern, structural_hash
+
+CREATE = "CREATE (a:Person {age: 1}), (b:Person {age: 1}), (a:Person {age: 1})"
+
+
+def parse(query):
+    return CypherParser(optimize=True).parse(query)
+
+
+def test_equal_subtrees_shared():
+    result = parse(CREATE)
+    interned = intern(result)
+    assert interned == result
+    [(_, [first, second, third])] = interned
+    # The two (a:Person {age: 1}) nodes are one object, and (b:...) shares
+    # the label list and property map with them.
+    assert first is third
+    assert first is not second
+    assert first[2] is second[2] and first[3] is second[3]
+
+
+def test_shared_across_calls():
+    interner = Interner()
+    one = interner.intern(parse("MATCH (n:Person) RETURN n.name"))
+    two = interner.intern(parse("MATCH (n:Person) RETURN n.age"))
+    assert one[0] is two[0]
+    assert one[1] is not two[1]
+    assert len(interner)
+    interner.clear()
+    assert len(interner) == 0
+    assert interner.intern(parse("MATCH (n:Person) RETURN n.name"))[0] is not one[0]
+
+
+def test_frozen_and_equal():
+    for query in data_list:
+        result = parse(query)
+        interned = intern(result)
+        assert interned == result
+        stack = [interned]
+        while stack:
+            node = stack.pop()
+            assert node.__class__ not in (list, dict), query
+            if isinstance(node, (tuple, list)):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                stack.extend(node.values())
+
+
+def test_scalar_types_kept_apart():
+    # 1, 1.0 and True are equal in Python, but not the same literal.
+    interned = intern([("x", 1), ("x", 1.0), ("x", True)])
+    assert [value.__class__ for _, value in interned] == [int, float, bool]
+    assert len({structural_hash(node) for node in interned}) == 3
+
+
+def test_structural_hash():
+    hashes = {structural_hash(parse(query)) for query in data_list}
+    assert structural_hash(parse(data_list[0])) in hashes
+    # Equal trees hash alike however they were built; different ones do not.
+    assert structural_hash(parse(CREATE)) == structural_hash(intern(parse(CREATE)))
+    assert structural_hash(("a", ["b"])) == structural_hash(("a", ["b"]))
+    assert structural_hash(("a", ["b"])) != structural_hash(("a", ("b",)))
+    assert len(hashes) == len({repr(parse(query)) for query in data_list})
+    assert Interner().hash(parse(CREATE)) == structural_hash(parse(CREATE))
+
+
+def test_structural_hash_stable_across_processes():
+    code = (
+        "from pcypher import CypherParser\n"
+        "from pcypher.intern import structural_hash\n"
+        f"print(structural_hash(CypherParser(optimize=True).parse({CREATE!r})))\n"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={"PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert outputs == {f"{structural_hash(parse(CREATE))}\n"}
+
+
+def test_parser_option():
+    parser = CypherParser(optimize=True, intern=True)
+    result = parser.parse(CREATE)
+    assert result == parse(CREATE)
+    [(_, [first, _, third])] = result
+    assert first is third
+
+
+def test_deep_tree(deep_query):
+    result = parse(deep_query)
+    assert structural_hash(intern(result)) == structural_hash(result)
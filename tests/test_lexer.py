@@ -0,0 +1,64 @@
+import pytest
+from cypher_sample import data_list, todo_list
+
+from pcypher import CypherParser
+
+# Inputs beyond the corpus: illegal characters, comments, line breaks and
+# odd spellings, on which the two lexer backends are most likely to part.
+EXTRA = [
+    "MATCH (n) WHERE n.name ENDS  WITH 'x' AND n.y IS NOT\nNULL RETURN n",
+    "match (N) return n.Name, `weird ``name`, $Param, 1.5e, 007, 3.",
+    "RETURN 1 ; RETURN 'a' # ~ \r\n RETURN \"b\\\"c\"",
+    "/* unterminated comment\nRETURN 'unterminated\nRETURN x // trailing",
+    "MATCH (a)<-[:R*1..2]-(b)-->(c) SET a += {k: -1} RETURN a.k^2 % 3 <= 4",
+    "",
+    "   \t\n\n  ",
+]
+
+INPUTS = data_list + todo_list + EXTRA
+
+
+@pytest.fixture(scope="module")
+def ply():
+    return CypherParser(optimize=True, on_error="collect")
+
+
+@pytest.fixture(scope="module")
+def fast():
+    return CypherParser(optimize=True, on_error="collect", lexer="fast")
+
+
+def errors(errors):
+    return [(e.message, e.lexpos, e.token, e.expected) for e in errors or []]
+
+
+def tokens(parser, query):
+    toks, errs = parser._tokenize(query, "collect")
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in toks], errors(errs)
+
+
+def parse(parser, query):
+    result, errs = parser.parse_with_errors(query)
+    return result, errors(errs)
+
+
+def test_same_tokens(ply, fast):
+    for query in INPUTS:
+        assert tokens(fast, query) == tokens(ply, query), query
+
+
+def test_same_parses(ply, fast):
+    for query in INPUTS:
+        expected = parse(ply, query)
+        assert parse(fast, query) == expected, query
+        for parser in (ply, fast):
+            assert parse(parser, parser.lexer.tokenize(query)) == expected, query
+
+
+def test_token_stream(ply):
+    stream = ply.lexer.tokenize("MATCH (n {name: 'x'}) RETURN $p, 1.5")
+    names = [stream.type(i) for i in range(len(stream))]
+    assert names[:3] == ["MATCH", "LPAREN", "IDENTIFIER"]
+    assert [stream.value(i) for i in range(len(stream))][-3:] == ["p", ",", 1.5]
+    assert stream.source(6) == "'x'" and stream.value(6) == "x"
+    assert not stream.errors
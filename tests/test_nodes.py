@@ -0,0 +1,45 @@
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.nodes import (
+    BinOp,
+    NodePattern,
+    Range,
+    RelationshipType,
+    WithWhereClause,
+    to_nodes,
+    to_tuples,
+)
+
+
+def test_round_trip():
+    parser = CypherParser(optimize=True)
+    typed = CypherParser(optimize=True, typed_ast=True)
+    for query in data_list:
+        expected = parser.parse(query)
+        result = typed.parse(query)
+        assert to_nodes(expected) == result
+        assert to_tuples(result) == expected
+
+
+def test_node_classes():
+    parser = CypherParser(optimize=True, typed_ast=True)
+    [match, with_, _] = parser.parse(
+        "MATCH (n:A {k: 1})-[r:R*1..2]->(m) WITH n WHERE n.k > 1 + 2 RETURN n"
+    )
+    [chain] = match.pattern
+    start, [(edge, _)] = chain.start, chain.steps
+    assert isinstance(start, NodePattern) and start.properties == [("k", 1)]
+    assert edge.relationship.types == [RelationshipType("r", "R")]
+    assert edge.relationship.length == Range(1, 2)
+    assert isinstance(with_, WithWhereClause)
+    assert isinstance(with_.where.right, BinOp)
+    assert with_.as_tuple() == ("WITH", ["n"], with_.where.as_tuple())
+    assert edge.relationship.as_tuple()[1] == [{"variable": "r", "type": "R"}]
+
+
+def test_deep_query(deep_query):
+    expected = CypherParser(optimize=True).parse(deep_query)
+    result = CypherParser(optimize=True, typed_ast=True).parse(deep_query)
+    assert to_tuples(result) == expected
+    assert result[0].as_tuple() == expected[0]
@@ -0,0 +1,37 @@
+import pytest
+from cypher_sample import data_list
+
+from pcypher import CypherParser, CypherSyntaxError
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CypherParser(optimize=True)
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, 64), (2, 1), (3, 7)])
+def test_matches_sequential(parser, workers, chunksize):
+    expected = [parser.parse_with_errors(query)[0] for query in data_list]
+    assert parser.parse_many(data_list, workers, chunksize) == expected
+
+
+def test_order_kept(parser):
+    queries = [f"RETURN {i}" for i in range(200)]
+    results = parser.parse_many(iter(queries), workers=4, chunksize=3)
+    assert results == [[("RETURN", [i])] for i in range(200)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_errors_in_place(parser, workers):
+    results = parser.parse_many(["RETURN 1", "RETURN", 42, "RETURN 2"], workers, 1)
+    assert results[0] == [("RETURN", [1])]
+    assert isinstance(results[1], CypherSyntaxError)
+    assert results[1].token is None and results[1].expected
+    # An exception raised in the worker comes back as the query's result.
+    assert isinstance(results[2], TypeError)
+    assert results[3] == [("RETURN", [2])]
+
+
+def test_worker_options():
+    parser = CypherParser(optimize=True, fold_constants=True)
+    assert parser.parse_many(["RETURN 1 + 2"], workers=2) == [[("RETURN", [3])]]
@@ -0,0 +1,33 @@
+from conftest import in_new_thread
+
+from pcypher import CypherParser
+from pcypher.profile import Profiler
+
+QUERY = "MATCH (n:Person {name: 'Ann'}) WHERE n.age > 30 RETURN n.name"
+
+
+def test_profiles_parses():
+    profiler = Profiler()
+    parser = CypherParser(optimize=True, profile=profiler)
+    parser.parse(QUERY)
+    parser.parse_with_errors(QUERY)
+    assert profiler.parses == 2
+    assert profiler.totals.tokens > 0
+    assert sum(profiler.totals.reductions.values()) > 0
+
+
+def test_unprofiled_methods_on_new_threads():
+    # Each runs on a thread that has never run a profiled parse.
+    profiler = Profiler()
+    parser = CypherParser(optimize=True, profile=profiler)
+    plain = CypherParser(optimize=True)
+    result, _, errors = in_new_thread(parser.parse_with_summary, QUERY)
+    assert result == plain.parse(QUERY) and not errors
+    template, literals = in_new_thread(parser.parse_template, QUERY)
+    assert template.fill(literals) == plain.parse(QUERY)
+    state = in_new_thread(parser.parse_incremental, QUERY)
+    assert state.result == plain.parse(QUERY)
+    parser = CypherParser(optimize=True, profile=profiler, spans=True)
+    result, spans, errors = in_new_thread(parser.parse_with_spans, QUERY)
+    assert result == plain.parse(QUERY) and len(spans)
+    assert profiler.parses == 0
@@ -0,0 +1,21 @@
+from conftest import in_new_thread
+
+from pcypher import CypherParser
+
+QUERY = "MATCH (n:Person) WHERE n.age > 30 RETURN n.name"
+
+
+def test_spans():
+    parser = CypherParser(optimize=True, spans=True)
+    result, spans, errors = parser.parse_with_spans(QUERY)
+    assert not errors
+    [match, ret] = result
+    assert spans.source(match) == "MATCH (n:Person) WHERE n.age > 30"
+    assert spans.source(ret) == "RETURN n.name"
+
+
+def test_other_parses_on_new_threads():
+    parser = CypherParser(optimize=True, spans=True)
+    expected = CypherParser(optimize=True).parse(QUERY)
+    assert in_new_thread(parser.parse, QUERY) == expected
+    assert in_new_thread(parser.parse_with_errors, QUERY) == (expected, [])
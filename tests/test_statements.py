@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from pcypher import CypherParser, CypherSyntaxError
+from pcypher.statements import split_statements
+
+TEXT = (
+    "MATCH (n) RETURN 'a;b' AS s;\n"
+    "// a comment; with a semicolon\n"
+    "RETURN `x;y`;\n"
+    '/* block; comment */ RETURN "c\\";d";;  ;\n'
+    "// only a comment;\n"
+    ";\n"
+    "RETURN 1 / 2 // trailing; comment\n"
+)
+
+STATEMENTS = [
+    "MATCH (n) RETURN 'a;b' AS s",
+    "// a comment; with a semicolon\nRETURN `x;y`",
+    '/* block; comment */ RETURN "c\\";d"',
+    "RETURN 1 / 2 // trailing; comment",
+]
+
+
+def test_split():
+    assert list(split_statements(TEXT)) == STATEMENTS
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 8))
+def test_chunk_boundaries(chunk_size):
+    stream = io.StringIO(TEXT)
+    assert list(split_statements(stream, chunk_size)) == STATEMENTS
+
+
+@pytest.mark.parametrize(
+    "text, statements",
+    [
+        ("", []),
+        (" ; \n ;", []),
+        ("RETURN 1", ["RETURN 1"]),
+        ("RETURN 1;", ["RETURN 1"]),
+        # An unterminated string or comment hides nothing.
+        ("RETURN 'a;b", ["RETURN 'a", "b"]),
+        ("RETURN 1 /* a;b", ["RETURN 1 /* a", "b"]),
+        # Strings do not span lines.
+        ("RETURN 'a\n;b'", ["RETURN 'a", "b'"]),
+    ],
+)
+def test_edge_cases(text, statements):
+    assert list(split_statements(text)) == statements
+    for chunk_size in range(1, 8):
+        assert list(split_statements(io.StringIO(text), chunk_size)) == statements
+
+
+def test_iter_parse():
+    parser = CypherParser(optimize=True, on_error="collect")
+    text = "MATCH (n) RETURN n; RETURN ; RETURN 'x;y'"
+    for chunk_size in (1, 3, 65536):
+        results = list(parser.iter_parse(io.StringIO(text), chunk_size))
+        assert results[0] == parser.parse("MATCH (n) RETURN n")
+        assert isinstance(results[1], CypherSyntaxError)
+        assert results[2] == [("RETURN", ["x;y"])]
+        assert len(results) == 3
@@ -0,0 +1,28 @@
+from cypher_sample import data_list
+
+from pcypher import CypherParser
+from pcypher.summary import summarize
+
+
+def test_summary():
+    parser = CypherParser(optimize=True)
+    _, summary, errors = parser.parse_with_summary(
+        "MATCH (a:Person {name: $name})-[:KNOWS]->(b:Person) "
+        "WHERE b.age > $age RETURN b.name, a {.email}"
+    )
+    assert not errors
+    assert summary.as_dict() == {
+        "params": {"name": 1, "age": 1},
+        "labels": {"Person": 2},
+        "relationship_types": {"KNOWS": 1},
+        "property_keys": {"name": 2, "age": 1, "email": 1},
+    }
+
+
+def test_summary_matches_walk():
+    parser = CypherParser(optimize=True)
+    for query in data_list:
+        result, summary, errors = parser.parse_with_summary(query)
+        if errors:
+            continue
+        assert summary == summarize(result), query
@@ -0,0 +1,55 @@
+import threading
+
+from cypher_sample import data_list
+
+from pcypher import CypherParser, get_parser
+
+THREADS = 32
+ROUNDS = 2
+
+
+def parse_everywhere(parser, parse=None):
+    """
+    Parse data_list on THREADS threads sharing parser and return the
+    queries whose results differ from a single-threaded parse.
+    """
+    parse = parse or parser.parse
+    expected = [parse(query) for query in data_list]
+    mismatches = []
+    failures = []
+    barrier = threading.Barrier(THREADS)
+
+    def work(offset):
+        try:
+            barrier.wait()
+            for _ in range(ROUNDS):
+                # Start each thread at a different query so parses overlap.
+                for i in range(len(data_list)):
+                    index = (i + offset) % len(data_list)
+                    if parse(data_list[index]) != expected[index]:
+                        mismatches.append(data_list[index])
+        except Exception as exc:  # Reported by the test, not the thread.
+            failures.append(exc)
+
+    threads = [threading.Thread(target=work, args=(n * 7,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not failures, failures[0]
+    return mismatches
+
+
+def test_shared_parser():
+    assert parse_everywhere(get_parser()) == []
+
+
+def test_shared_parser_collecting_errors():
+    parser = CypherParser(optimize=True, on_error="collect")
+    assert parse_everywhere(parser, lambda q: repr(parser.parse(q))) == []
+
+
+def test_states_are_pooled():
+    parser = CypherParser(optimize=True)
+    parse_everywhere(parser)
+    assert 0 < len(parser._pool) <= THREADS
@@ -0,0 +1,130 @@
+import pytest
+
+from pcypher import CypherParser
+from pcypher.visitor import SKIP, STOP, Transformer, Visitor
+
+QUERY = (
+    "MATCH (n:Person {name: 'x'}) WHERE n.age > 1 + 2 "
+    "RETURN n.name, {binop: 1, list: [n.x]}"
+)
+
+
+@pytest.fixture(scope="module")
+def result():
+    return CypherParser(optimize=True).parse(QUERY)
+
+
+class Recorder(Visitor):
+    def __init__(self):
+        self.seen = []
+
+    def visit_binop(self, node):
+        self.seen.append(("binop", node[1]))
+
+    def visit_property(self, node):
+        self.seen.append(("property", node[2]))
+
+
+class Everything(Visitor):
+    def __init__(self):
+        self.tags = []
+
+    def visit_node(self, node):
+        self.tags.append("NODE")
+
+    def generic_visit(self, node):
+        self.tags.append(node[0])
+
+
+def test_dispatch(result):
+    recorder = Recorder()
+    assert recorder.walk(result) is None
+    # Pre-order, left to right.  The ("binop", 1) and ("list", ...) pairs of
+    # the map literal are key, value pairs, not tagged tuples.
+    assert recorder.seen == [
+        ("binop", ">"),
+        ("property", "age"),
+        ("binop", "+"),
+        ("property", "name"),
+        ("property", "x"),
+    ]
+
+
+def test_generic_visit(result):
+    walker = Everything()
+    walker.walk(result)
+    assert walker.tags == [
+        "MATCH",
+        "NODE",
+        "binop",
+        "property",
+        "binop",
+        "RETURN",
+        "property",
+        "map",
+        "list",
+        "property",
+    ]
+
+
+def test_skip_and_stop(result):
+    class Skipping(Recorder):
+        def visit_binop(self, node):
+            super().visit_binop(node)
+            return SKIP
+
+    class Stopping(Recorder):
+        def visit_property(self, node):
+            super().visit_property(node)
+            return STOP
+
+    skipping = Skipping()
+    skipping.walk(result)
+    assert skipping.seen == [("binop", ">"), ("property", "name"), ("property", "x")]
+    stopping = Stopping()
+    assert stopping.walk(result) == ("property", "n", "age")
+    assert stopping.seen == [("binop", ">"), ("property", "age")]
+
+
+class AddFolder(Transformer):
+    def transform_binop(self, node):
+        _, op, left, right = node
+        if op == "+" and left.__class__ is int and right.__class__ is int:
+            return left + right
+        return node
+
+
+def test_transform_rebuilds_changed_path(result):
+    new = AddFolder().transform(result)
+    match, ret = new
+    assert match[2] == ("binop", ">", ("property", "n", "age"), 3)
+    # Untouched subtrees are shared; only the path to the change is new.
+    assert ret is result[1]
+    assert match[1] is result[0][1]
+    assert match[2][2] is result[0][2][2]
+    assert match is not result[0] and new is not result
+
+
+def test_transform_unchanged_shares_everything(result):
+    assert AddFolder().transform(result[1:]) == result[1:]
+    tree = result[1]
+    assert AddFolder().transform(tree) is tree
+
+
+def test_transform_bottom_up():
+    # Only works if the operands of every binop are evaluated already.
+    class Evaluate(Transformer):
+        def transform_binop(self, node):
+            _, op, left, right = node
+            return {"+": left + right, "-": left - right, "*": left * right}[op]
+
+    result = CypherParser(optimize=True).parse("RETURN 1 + 2 * 3 - 4")
+    assert Evaluate().transform(result) == [("RETURN", [1 + 6 - 4])]
+
+
+def test_deep_tree(deep_query):
+    result = CypherParser(optimize=True).parse(deep_query)
+    recorder = Recorder()
+    recorder.walk(result)
+    assert recorder.seen.count(("binop", "=")) == 250
+    assert AddFolder().transform(result) is result